@@ -0,0 +1,8 @@
+"""Plain helpers shared by test modules; fixtures live in conftest.py"""
+
+from orjson import loads as _json_loads
+
+
+def rjson(response):
+    """Decode a JSON response body with orjson"""
+    return _json_loads(response.content)
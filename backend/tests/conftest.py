@@ -0,0 +1,498 @@
+"""
+Shared fixtures for the backend test suite.
+
+HTTP fixtures run in-process through FastAPI's TestClient by default. Pass
+--live to send them to the running Docker stack at BACKEND_URL instead
+(docker-compose up -d); logins use the accounts seeded by database/seed.sql.
+Both transports are httpx clients, so tests see the same API either way.
+
+Database fixtures run against PostgreSQL (settings.database_url). One
+connection and one outer transaction are held for the whole session; each
+test gets a Session inside a SAVEPOINT that is rolled back afterwards, so
+session-scoped seed data is shared while per-test writes never leak.
+
+The suite runs in parallel with pytest-xdist (-n auto --dist loadgroup, set in
+pytest.ini; pass -n 0 to debug serially). Each worker creates
+the tables in its own schema inside that outer transaction and seeds its own
+tenant, so workers never contend on rows or unique keys. That schema has no
+seed.sql data: in-process tests that log in as or read seeded rows are marked
+seeded (or use token) and run against the public schema instead. Tests that
+share one live backend or the seeded public schema are pinned to a single
+worker with xdist_group("live_backend") / xdist_group("rls").
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:7100")
+
+# Raw SQL replayed by --reseed: wipe runtime data, then re-insert the seed rows
+_DATABASE_DIR = Path(__file__).resolve().parents[2] / "database"
+SEED_SQL_FILES = (_DATABASE_DIR / "reset_dev_data.sql", _DATABASE_DIR / "seed.sql")
+
+# Password shared by the accounts seeded in database/seed.sql
+PASSWORD = "jspark123"
+
+# Live-backend request timeout: 2s to connect, 5s for everything else
+HTTP_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+# Fixed primary keys of the read-only rows the connection fixture inserts (see canonical_ids)
+CANONICAL_IDS = {
+    "tenant": UUID("c0000000-0000-4000-8000-000000000001"),
+    "department": UUID("c0000000-0000-4000-8000-000000000002"),
+    "user": UUID("c0000000-0000-4000-8000-000000000003"),
+    "wallet": UUID("c0000000-0000-4000-8000-000000000004"),
+}
+
+# Precomputed cost-4 bcrypt hash of "password" for fixture users: fixtures
+# never hash, and logins verifying it pay 16 rounds instead of 4096.
+TEST_PASSWORD_HASH = "$2b$04$6.V7fFzdgUxkFYU4MRGG2uQUzcamcNHQSHRRRGkyLw/SbPqIKVVgi"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--live",
+        action="store_true",
+        default=False,
+        help="send http-fixture requests to the running backend at BACKEND_URL",
+    )
+    parser.addoption(
+        "--reseed",
+        action="store_true",
+        default=False,
+        help="reset the database to seed-only state from the raw SQL seed files before the run",
+    )
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="also run tests marked slow (CI runs them; local loops skip them)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test; pass --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+def pytest_configure(config):
+    """With --reseed, replay reset_dev_data.sql + seed.sql as raw SQL (no ORM) once per run.
+
+    Runs on the xdist controller (or the only process without xdist) before
+    any worker starts, so the shared public schema is never wiped while
+    tests are reading it. By default the database is assumed to be seeded
+    already and nothing runs.
+    """
+    if not config.getoption("--reseed") or hasattr(config, "workerinput"):
+        return
+    from database import engine as app_engine
+
+    try:
+        raw = app_engine.raw_connection()
+    except app_engine.dialect.dbapi.OperationalError as exc:
+        # raw_connection() raises the driver's error, not SQLAlchemy's wrapper
+        raise pytest.UsageError(f"--reseed: database unreachable: {exc}") from None
+    try:
+        raw.autocommit = True
+        with raw.cursor() as cursor:
+            # Each autocommitted statement would otherwise wait on a WAL flush
+            cursor.execute("SET synchronous_commit TO off")
+            for sql_file in SEED_SQL_FILES:
+                cursor.execute(sql_file.read_text())
+    finally:
+        raw.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_password_hashing():
+    """Hash new passwords with the minimum bcrypt cost (4 rounds) during tests.
+
+    Session-wide, so fixtures of every scope that create users are covered.
+    Existing hashes still verify at whatever cost they were created with.
+    Yields the production CryptContext for _production_password_hashing.
+    """
+    import auth.utils
+
+    production = auth.utils.pwd_context
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth.utils, "pwd_context", production.copy(bcrypt__rounds=4))
+        yield production
+
+
+@pytest.fixture(autouse=True)
+def _production_password_hashing(request, _fast_password_hashing):
+    """Give tests marked password_hashing the production CryptContext back"""
+    if request.node.get_closest_marker("password_hashing") is None:
+        return
+    import auth.utils
+
+    request.getfixturevalue("monkeypatch").setattr(auth.utils, "pwd_context", _fast_password_hashing)
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI application, imported (routes and models built) once per session"""
+    from main import app as fastapi_app
+
+    return fastapi_app
+
+
+def _insert_canonical_rows(conn):
+    """Plain INSERTs (no ORM) of the CANONICAL_IDS tenant/department/user/wallet"""
+    ids = {name: str(value) for name, value in CANONICAL_IDS.items()}
+    conn.execute(text(
+        "INSERT INTO tenants (id, name, slug, status, master_budget_balance, budget_allocated, budget_allocation_balance)"
+        " VALUES (:tenant, 'Canonical Tenant', 'canonical-tenant', 'active', 0, 0, 0)"
+    ), ids)
+    conn.execute(text(
+        "INSERT INTO departments (id, tenant_id, name, budget_balance, budget_allocated)"
+        " VALUES (:department, :tenant, 'Canonical', 0, 0)"
+    ), ids)
+    conn.execute(text(
+        "INSERT INTO users (id, tenant_id, department_id, corporate_email, password_hash, first_name, last_name, org_role, status)"
+        " VALUES (:user, :tenant, :department, 'canonical@example.com', :password_hash, 'Canonical', 'User', 'tenant_user', 'ACTIVE')"
+    ), {**ids, "password_hash": TEST_PASSWORD_HASH})
+    conn.execute(text(
+        "INSERT INTO wallets (id, tenant_id, user_id, balance, lifetime_earned, lifetime_spent)"
+        " VALUES (:wallet, :tenant, :user, 5000, 0, 0)"
+    ), ids)
+
+
+def _connection_get_db(connection):
+    """get_db replacement yielding Sessions on the test connection"""
+    def override_get_db():
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+
+    return override_get_db
+
+
+def _database_connection(request, name):
+    """The named connection fixture, or None when the database is unreachable"""
+    if not request.getfixturevalue("database_reachable"):
+        return None
+    return request.getfixturevalue(name)
+
+
+@pytest.fixture(scope="session")
+def client(app, request):
+    """In-process TestClient for the FastAPI app.
+
+    Entered as a context manager so the app lifespan runs once per session and
+    every request reuses one event-loop portal instead of starting its own.
+    get_db is bound to the test connection, so rows inserted by the tenant,
+    canonical_ids and db_session fixtures are visible to the endpoints and
+    whatever the endpoints write is rolled back with the outer transaction.
+    """
+    from database import get_db
+
+    # Without a database get_db is left alone so DB-free endpoints still work
+    connection = _database_connection(request, "connection")
+    if connection is not None:
+        app.dependency_overrides[get_db] = _connection_get_db(connection)
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(autouse=True)
+def _client_dependency_overrides(request):
+    """Fix app.dependency_overrides for every test that talks to the in-process app.
+
+    The app is a process-wide singleton and several modules install their own
+    overrides at import time, so without this what the session client sees
+    would depend on collection order. Tests that use client or app (or http
+    without --live) get exactly one override, get_db bound to a per-test transaction,
+    and the previous overrides are restored afterwards. Tests that read the
+    seed.sql rows (marked seeded, or logging in through token) are bound to
+    pg_connection, which sees the seeded public schema; everything else is
+    bound to connection.
+    """
+    names = request.fixturenames
+    in_process = "client" in names or "app" in names or (
+        "http" in names and not request.config.getoption("--live")
+    )
+    if not in_process:
+        yield
+        return
+    from database import get_db
+
+    app = request.getfixturevalue("app")
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides.clear()
+    seeded = "token" in names or request.node.get_closest_marker("seeded") is not None
+    connection = _database_connection(request, "pg_connection" if seeded else "connection")
+    trans = None
+    if connection is not None:
+        trans = connection.begin_nested() if connection.in_transaction() else connection.begin()
+        app.dependency_overrides[get_db] = _connection_get_db(connection)
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved)
+    if trans is not None and trans.is_active:
+        trans.rollback()
+
+
+@pytest.fixture(scope="session")
+def http(request):
+    """HTTP client for API tests: in-process by default, keep-alive httpx.Client with --live"""
+    if not request.config.getoption("--live"):
+        yield request.getfixturevalue("client")
+        return
+    live = httpx.Client(
+        base_url=BACKEND_URL,
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+    )
+    try:
+        live.get("/health", timeout=1.0)
+    except httpx.HTTPError:
+        live.close()
+        pytest.skip(f"backend unreachable at {BACKEND_URL}")
+    yield live
+    live.close()
+
+
+@pytest.fixture(scope="session")
+def database_reachable():
+    """Whether settings.database_url accepts connections, probed once per session"""
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.pool import NullPool
+    from config import settings
+
+    # Throwaway engine with a short connect timeout, so a dead or unroutable
+    # host costs ~2s once rather than the OS TCP timeout
+    probe = create_engine(settings.database_url, poolclass=NullPool, connect_args={"connect_timeout": 2})
+    try:
+        with probe.connect():
+            return True
+    except OperationalError:
+        return False
+    finally:
+        probe.dispose()
+
+
+@pytest.fixture(scope="session")
+def backend_available(request, http, database_reachable):
+    """Skip dependent tests once, up front, when the backend cannot serve requests.
+
+    With --live the http fixture has already probed /health. In-process, the
+    app is only as available as its database.
+    """
+    if not request.config.getoption("--live") and not database_reachable:
+        pytest.skip("database unreachable; in-process backend cannot serve requests")
+
+
+@pytest.fixture(scope="session")
+def token(http):
+    """Factory returning an access token for a seeded account; logs in once per email"""
+    cache = {}
+
+    def _get(email: str) -> str:
+        if email not in cache:
+            response = http.post(
+                "/api/auth/login",
+                json={"email": email, "password": PASSWORD}
+            )
+            assert response.status_code == 200, f"Login failed: {response.text}"
+            cache[email] = response.json()["access_token"]
+        return cache[email]
+
+    return _get
+
+
+@pytest.fixture(scope="session")
+def rjson():
+    """JSON response-body decoder (orjson), see tests/_helpers.py"""
+    from tests._helpers import rjson as decode
+
+    return decode
+
+
+@pytest.fixture(scope="session")
+def password_hash():
+    """bcrypt hash of "password" for users created by fixtures"""
+    return TEST_PASSWORD_HASH
+
+
+@lru_cache(maxsize=1024)
+def _cached_token(user_id: str, tenant_id: str, email: str, org_role: str) -> str:
+    """Signed access token per distinct claim set (module scope, never per fixture)"""
+    from auth.utils import create_access_token
+
+    return create_access_token({
+        "sub": user_id,
+        "tenant_id": tenant_id,
+        "email": email,
+        "org_role": org_role,
+        "type": "tenant"
+    })
+
+
+@pytest.fixture(scope="session")
+def user_token():
+    """Token factory for fixture users; each user's token is signed once per session.
+
+    Takes anything with id, tenant_id, corporate_email and org_role attributes.
+    """
+    def _get(user):
+        return _cached_token(str(user.id), str(user.tenant_id), user.corporate_email, user.org_role)
+
+    return _get
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Test engine holding exactly one Postgres connection"""
+    from config import settings
+
+    test_engine = create_engine(
+        settings.database_url,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=False,
+    )
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def connection(engine):
+    """Single database connection wrapped in a transaction that is never committed.
+
+    Under xdist the worker schema is built with create_all and holds no
+    seed.sql rows; tests that need them are marked seeded and get
+    pg_connection instead (see _client_dependency_overrides).
+    """
+    conn = engine.connect()
+    outer = conn.begin()
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker:
+        # Private schema per xdist worker; DDL is transactional, so the
+        # rollback below drops it again
+        import models  # noqa: F401 - registers every table on Base.metadata
+        from database import Base
+
+        schema = f"test_{worker}"
+        conn.exec_driver_sql(f'CREATE SCHEMA "{schema}"')
+        conn.exec_driver_sql(f'SET LOCAL search_path TO "{schema}", public')
+        Base.metadata.create_all(conn)
+    # Eagerly, at the outer-transaction level: created lazily inside some
+    # module's SAVEPOINT, they would vanish with that module's rollback
+    _insert_canonical_rows(conn)
+    yield conn
+    outer.rollback()
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def pg_connection():
+    """Connection from the application's pooled engine, checked out once per session.
+
+    Unlike connection, this always sees the seeded public schema, which is what
+    the RLS and seed-inspection tests query.
+    """
+    from database import engine as app_engine
+
+    conn = app_engine.connect()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def pg_conn(pg_connection):
+    """pg_connection inside a per-test transaction that is always rolled back.
+
+    SET LOCAL, SET ROLE and GRANT issued by a test are undone with it, so
+    nothing leaks into the next test sharing the connection.
+    """
+    trans = pg_connection.begin()
+    yield pg_connection
+    trans.rollback()
+
+
+@pytest.fixture(scope="session")
+def tenant(connection):
+    """Tenant shared by every test in the session, one per xdist worker"""
+    from models import Tenant
+
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    tenant = Tenant(
+        name=f"Test Tenant {worker}",
+        slug=f"test-tenant-{uuid4().hex[:8]}",
+        status="active"
+    )
+    session.add(tenant)
+    session.commit()
+    yield tenant
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def canonical_ids(connection):
+    """The CANONICAL_IDS rows: one tenant/department/user/wallet shared read-only.
+
+    They are inserted by the connection fixture itself, outside any
+    SAVEPOINT, so no module- or test-level rollback can remove them. Tests
+    that only read (list endpoints, auth checks) use these rows instead of
+    building their own, and must not modify them.
+    """
+    return CANONICAL_IDS
+
+
+@pytest.fixture(scope="session")
+def canonical_token(canonical_ids, user_token):
+    """Access token for the canonical user"""
+    from types import SimpleNamespace
+
+    return user_token(SimpleNamespace(
+        id=canonical_ids["user"],
+        tenant_id=canonical_ids["tenant"],
+        corporate_email="canonical@example.com",
+        org_role="tenant_user",
+    ))
+
+
+@pytest.fixture(scope="module")
+def module_session(connection):
+    """Session for module-scoped seed fixtures, rolled back when the module ends.
+
+    Seed data is inserted once per module inside its own SAVEPOINT; each test's
+    db_session then nests another SAVEPOINT on top of it.
+    """
+    nested = connection.begin_nested()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    nested.rollback()
+
+
+@pytest.fixture
+def db_session(connection):
+    """Per-test Session; commits release a SAVEPOINT and everything is rolled back.
+
+    join_transaction_mode="create_savepoint" opens a fresh SAVEPOINT after each
+    commit, so no after_transaction_end restart hook is needed, and since the
+    outer transaction never commits no row is ever flushed to disk.
+    """
+    nested = connection.begin_nested()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    nested.rollback()
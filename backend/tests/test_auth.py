@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from auth.utils import verify_password, get_password_hash, create_access_token, decode_token
 
 
+@pytest.mark.password_hashing
 class TestPasswordHashing:
     """Test password hashing utilities"""
     
@@ -2,6 +2,7 @@
 Integration Tests for Events API
 Comprehensive tests for event management endpoints with real database interactions
 """
+import json
 import pytest
 from fastapi.testclient import TestClient
 from uuid import uuid4
@@ -22,9 +23,11 @@ class TestEventsApiIntegration:
         assert response.status_code == 200
         events = response.json()
         
-        # Verify all events belong to current tenant
+        # Verify all events belong to current tenant (single IN query, not N+1)
+        ids = [e['id'] for e in events]
+        db_events = {str(e.id): e for e in db_session.query(Event).filter(Event.id.in_(ids)).all()}
         for event in events:
-            db_event = db_session.query(Event).filter_by(id=event.get('id')).first()
+            db_event = db_events.get(event['id'])
             assert db_event is None or db_event.tenant_id == tenant.id
     
     def test_create_event_success(self, client, tenant_tenant_tenant_manager_token, tenant):
@@ -189,56 +192,44 @@ class TestEventsApiIntegration:
         assert len(events) <= 5
 
 
+# Invalid create-event bodies, serialized once at import time
+_INVALID_EVENT_BODIES = {
+    "invalid_event_type": {
+        "title": "Test",
+        "description": "Test",
+        "event_type": "invalid_type",
+        "date": "2026-02-15T10:00:00"
+    },
+    "missing_description": {
+        "title": "Test",
+        "event_type": "meeting",
+        "date": "2026-02-15T10:00:00"
+    },
+    "invalid_date_format": {
+        "title": "Test",
+        "description": "Test",
+        "event_type": "meeting",
+        "date": "not-a-date"
+    },
+}
+_INVALID_EVENT_PAYLOADS = {
+    name: json.dumps(body).encode() for name, body in _INVALID_EVENT_BODIES.items()
+}
+
+
 class TestEventsValidation:
     """Tests for event validation"""
     
-    def test_invalid_event_type_rejected(self, client, tenant_tenant_tenant_manager_token):
-        """Test invalid event type is rejected"""
-        event_data = {
-            "title": "Test",
-            "description": "Test",
-            "event_type": "invalid_type",
-            "date": "2026-02-15T10:00:00"
-        }
-        
+    @pytest.mark.parametrize("case", list(_INVALID_EVENT_PAYLOADS))
+    def test_invalid_event_rejected(self, client, tenant_tenant_tenant_manager_token, case):
+        """Test invalid type, missing required field and bad date are rejected"""
         response = client.post(
             "/events",
-            json=event_data,
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
-        )
-        
-        assert response.status_code == 422
-    
-    def test_missing_required_field_rejected(self, client, tenant_tenant_tenant_manager_token):
-        """Test missing required fields are rejected"""
-        event_data = {
-            "title": "Test",
-            # Missing description
-            "event_type": "meeting",
-            "date": "2026-02-15T10:00:00"
-        }
-        
-        response = client.post(
-            "/events",
-            json=event_data,
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
-        )
-        
-        assert response.status_code == 422
-    
-    def test_invalid_date_format_rejected(self, client, tenant_tenant_tenant_manager_token):
-        """Test invalid date format is rejected"""
-        event_data = {
-            "title": "Test",
-            "description": "Test",
-            "event_type": "meeting",
-            "date": "not-a-date"
-        }
-        
-        response = client.post(
-            "/events",
-            json=event_data,
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            content=_INVALID_EVENT_PAYLOADS[case],
+            headers={
+                "Authorization": f"Bearer {tenant_tenant_tenant_manager_token}",
+                "Content-Type": "application/json",
+            }
         )
         
         assert response.status_code == 422
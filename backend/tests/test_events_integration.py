@@ -1,231 +1,164 @@
 """
 Integration tests for Event Creation API.
-These tests run against the actual running Docker backend.
+By default these run in-process through TestClient against the seeded database.
 
-To run these tests:
+To run them against the actual running Docker backend instead:
 1. Ensure Docker containers are running: docker-compose up -d
-2. Run: pytest tests/test_events_integration.py -v
+2. Run: pytest tests/test_events_integration.py -m live_backend --live -v
 """
 
-import pytest
-import requests
+import logging
 import os
+
+import pytest
 from datetime import datetime, timedelta
 from uuid import uuid4
 
+log = logging.getLogger(__name__)
+
 # Configuration
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:7100")
 TENANT_ID = "100e8400-e29b-41d4-a716-446655440000"  # jSpark tenant from seed.sql
 DEPT_ID = "110e8400-e29b-41d4-a716-446655440000"  # HR department
 
-# Test account credentials
+# Test accounts (password is conftest.PASSWORD)
 SUPER_USER_EMAIL = "super_user@sparknode.io"
 ADMIN_USER_EMAIL = "tenant_tenant_tenant_manager@sparknode.io"
 REGULAR_USER_EMAIL = "user@sparknode.io"
-PASSWORD = "jspark123"
+
+# Event dates, computed once at import
+_NOW = datetime.utcnow()
+_NOW_ISO = _NOW.isoformat()
+_START_DT = (_NOW + timedelta(days=7)).isoformat()
+_END_DT = (_NOW + timedelta(days=8)).isoformat()
+_NOM_END = (_NOW + timedelta(days=5)).isoformat()
+
+
+# Event payload templates built once; tests copy them with a unique title
+_FULL_EVENT_TEMPLATE = {
+    "title": "Test Event",
+    "description": "Test event for API",
+    "type": "celebration",
+    "start_datetime": _START_DT,
+    "end_datetime": _END_DT,
+    "venue": "Main Hall",
+    "location": "Building A",
+    "format": "hybrid",
+    "banner_url": "https://example.com/banner.jpg",
+    "color_code": "#FF5733",
+    "status": "draft",
+    "visibility": "all_employees",
+    "visible_to_departments": [DEPT_ID],
+    "nomination_start": _NOW_ISO,
+    "nomination_end": _NOM_END,
+    "who_can_nominate": "all_employees",
+    "max_activities_per_person": 3,
+    "planned_budget": 5000.00,
+    "currency": "USD"
+}
+
+_MINIMAL_EVENT_TEMPLATE = {
+    "title": "Minimal Event",
+    "type": "celebration",
+    "start_datetime": _START_DT,
+    "end_datetime": _END_DT,
+}
 
 
+def _full_payload():
+    """Event payload with every optional field populated"""
+    return {**_FULL_EVENT_TEMPLATE, "title": f"Test Event {uuid4().hex}"}
+
+
+def _minimal_payload():
+    """Event payload with only the required fields"""
+    return {**_MINIMAL_EVENT_TEMPLATE, "title": f"Minimal Event {uuid4().hex}"}
+
+
+# Shared body for requests that are rejected before the payload is used
+_MINIMAL_PAYLOAD = {
+    "title": "Unauthenticated Event",
+    "type": "celebration",
+    "start_datetime": _START_DT,
+    "end_datetime": _END_DT,
+}
+
+
+@pytest.mark.live_backend
+@pytest.mark.seeded
 class TestEventCreationIntegration:
-    """Integration tests for event creation endpoints"""
-    
-    @pytest.fixture(scope="class")
-    def admin_token(self):
-        """Get admin authentication token"""
-        response = requests.post(
-            f"{BACKEND_URL}/api/auth/login",
-            json={"email": ADMIN_USER_EMAIL, "password": PASSWORD}
-        )
-        assert response.status_code == 200, f"Login failed: {response.text}"
-        return response.json()["access_token"]
-    
-    @pytest.fixture(scope="class")
-    def platform_admin_token(self):
-        """Get platform admin authentication token"""
-        response = requests.post(
-            f"{BACKEND_URL}/api/auth/login",
-            json={"email": SUPER_USER_EMAIL, "password": PASSWORD}
-        )
-        assert response.status_code == 200, f"Login failed: {response.text}"
-        return response.json()["access_token"]
-    
-    @pytest.fixture(scope="class")
-    def regular_user_token(self):
-        """Get regular user authentication token"""
-        response = requests.post(
-            f"{BACKEND_URL}/api/auth/login",
-            json={"email": REGULAR_USER_EMAIL, "password": PASSWORD}
-        )
-        assert response.status_code == 200, f"Login failed: {response.text}"
-        return response.json()["access_token"]
-    
-    def test_create_event_without_authentication(self):
-        """Test that event creation fails without authentication token"""
-        event_data = {
-            "title": "Unauthenticated Event",
-            "type": "celebration",
-            "start_datetime": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "end_datetime": (datetime.utcnow() + timedelta(days=8)).isoformat(),
-        }
-        
-        response = requests.post(
-            f"{BACKEND_URL}/api/events/",
-            json=event_data
-        )
-        
-        # API returns 401 for missing credentials
-        assert response.status_code == 401, f"Expected 401, got {response.status_code}: {response.text}"
-        assert "Not authenticated" in response.text or "credentials" in response.text.lower()
+    """Integration tests for event creation endpoints.
+
+    The http fixture and the token(email) factory are session-scoped in
+    conftest.py, so each account logs in once over whichever transport is
+    selected.
+    """
     
-    def test_create_event_with_invalid_token(self):
-        """Test that event creation fails with invalid authentication token"""
-        event_data = {
-            "title": "Invalid Token Event",
-            "type": "celebration",
-            "start_datetime": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "end_datetime": (datetime.utcnow() + timedelta(days=8)).isoformat(),
-        }
-        
-        response = requests.post(
+    @pytest.mark.parametrize("headers,detail", [
+        (None, "Not authenticated"),
+        ({"Authorization": "Bearer invalid_token_xyz"}, "Could not validate credentials"),
+    ], ids=["no-token", "invalid-token"])
+    def test_create_event_rejects_bad_auth(self, http, headers, detail):
+        """Event creation fails without a token or with an invalid one"""
+        response = http.post(
             f"{BACKEND_URL}/api/events/",
-            json=event_data,
-            headers={"Authorization": "Bearer invalid_token_xyz"}
+            json=_MINIMAL_PAYLOAD,
+            headers=headers
         )
         
+        # API returns 401 for missing or invalid credentials
         assert response.status_code == 401, f"Expected 401, got {response.status_code}: {response.text}"
-        assert "Could not validate credentials" in response.text
+        assert response.json()["detail"] == detail
     
-    def test_create_event_with_valid_token(self, admin_token):
-        """Test creating an event with valid authentication token"""
-        event_data = {
-            "title": f"Test Event {datetime.utcnow().isoformat()}",
-            "description": "Test event for API",
-            "type": "celebration",
-            "start_datetime": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "end_datetime": (datetime.utcnow() + timedelta(days=8)).isoformat(),
-            "venue": "Main Hall",
-            "location": "Building A",
-            "format": "hybrid",
-            "banner_url": "https://example.com/banner.jpg",
-            "color_code": "#FF5733",
-            "status": "draft",
-            "visibility": "all_employees",
-            "visible_to_departments": [DEPT_ID],
-            "nomination_start": datetime.utcnow().isoformat(),
-            "nomination_end": (datetime.utcnow() + timedelta(days=5)).isoformat(),
-            "who_can_nominate": "all_employees",
-            "max_activities_per_person": 3,
-            "planned_budget": 5000.00,
-            "currency": "USD"
-        }
+    @pytest.mark.parametrize("email,payload_fn,expected_status,expect_tenant", [
+        (ADMIN_USER_EMAIL, _full_payload, 200, False),
+        (ADMIN_USER_EMAIL, _minimal_payload, 200, True),
+        (SUPER_USER_EMAIL, _minimal_payload, 403, False),
+        (REGULAR_USER_EMAIL, _minimal_payload, 403, False),
+    ], ids=["admin-full", "admin-minimal", "platform-admin-forbidden", "regular-user-forbidden"])
+    def test_create_event(self, http, token, email, payload_fn, expected_status, expect_tenant):
+        """Only tenant managers may create events; created events land in the caller's tenant"""
+        event_data = payload_fn()
         
-        response = requests.post(
+        response = http.post(
             f"{BACKEND_URL}/api/events/",
             json=event_data,
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers={"Authorization": f"Bearer {token(email)}"}
         )
         
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+        assert response.status_code == expected_status, f"Expected {expected_status}, got {response.status_code}: {response.text}"
+        if expected_status != 200:
+            log.info("%s correctly blocked from event creation", email)
+            return
         data = response.json()
         assert "id" in data, "Response should contain event ID"
         assert data["title"] == event_data["title"]
-        assert data["status"] == "draft"
-        print(f"✓ Event created successfully: {data['id']}")
+        if "status" in event_data:
+            assert data["status"] == event_data["status"]
+        if expect_tenant:
+            assert str(data["tenant_id"]) == TENANT_ID
+        log.info("Event created successfully: %s", data["id"])
     
-    def test_create_event_with_minimal_fields(self, admin_token):
-        """Test creating event with only required fields"""
-        event_data = {
-            "title": f"Minimal Event {datetime.utcnow().isoformat()}",
-            "type": "celebration",
-            "start_datetime": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "end_datetime": (datetime.utcnow() + timedelta(days=8)).isoformat(),
-        }
-        
-        response = requests.post(
-            f"{BACKEND_URL}/api/events/",
-            json=event_data,
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
-        assert data["title"] == event_data["title"]
-        print(f"✓ Minimal event created successfully: {data['id']}")
-    
-    def test_create_event_with_platform_admin(self, platform_admin_token):
-        """Platform admin should be forbidden from creating events now that only tenant managers may do so"""
-        event_data = {
-            "title": f"Platform Admin Event {datetime.utcnow().isoformat()}",
-            "type": "celebration",
-            "start_datetime": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "end_datetime": (datetime.utcnow() + timedelta(days=8)).isoformat(),
-        }
-        
-        response = requests.post(
-            f"{BACKEND_URL}/api/events/",
-            json=event_data,
-            headers={"Authorization": f"Bearer {platform_admin_token}"}
-        )
-        
-        assert response.status_code == 403, f"Expected 403 for platform admin, got {response.status_code}: {response.text}"
-        print("✓ platform admin is correctly blocked from event creation")
-    
-    def test_create_event_with_regular_user(self, regular_user_token):
-        """Regular tenant user should be blocked from creating events"""
-        event_data = {
-            "title": f"Regular User Event {datetime.utcnow().isoformat()}",
-            "type": "celebration",
-            "start_datetime": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "end_datetime": (datetime.utcnow() + timedelta(days=8)).isoformat(),
-        }
-        
-        response = requests.post(
-            f"{BACKEND_URL}/api/events/",
-            json=event_data,
-            headers={"Authorization": f"Bearer {regular_user_token}"}
-        )
-        assert response.status_code == 403, f"Expected 403 for regular user, got {response.status_code}: {response.text}"
-        print("✓ regular user correctly blocked from event creation")
-    
-    def test_list_events_with_valid_token(self, admin_token):
+    def test_list_events_with_valid_token(self, http, token):
         """Test listing events with valid authentication"""
-        response = requests.get(
+        response = http.get(
             f"{BACKEND_URL}/api/events/",
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers={"Authorization": f"Bearer {token(ADMIN_USER_EMAIL)}"}
         )
         
         assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
         events = response.json()
         assert isinstance(events, list), "Response should be a list"
-        print(f"✓ Listed {len(events)} events")
+        log.info("Listed %d events", len(events))
     
-    def test_list_events_without_token(self):
+    def test_list_events_without_token(self, http):
         """Test that listing events fails without authentication"""
-        response = requests.get(f"{BACKEND_URL}/api/events/")
+        response = http.get(f"{BACKEND_URL}/api/events/")
         
         # API returns 401 for missing credentials
         assert response.status_code == 401, f"Expected 401, got {response.status_code}"
-        print("✓ Event listing blocked without authentication")
-    
-    def test_event_belongs_to_correct_tenant(self, admin_token):
-        """Test that created event belongs to the user's tenant"""
-        event_data = {
-            "title": f"Tenant Test Event {datetime.utcnow().isoformat()}",
-            "type": "celebration",
-            "start_datetime": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "end_datetime": (datetime.utcnow() + timedelta(days=8)).isoformat(),
-        }
-        
-        response = requests.post(
-            f"{BACKEND_URL}/api/events/",
-            json=event_data,
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert str(data["tenant_id"]) == TENANT_ID
-        print(f"✓ Event correctly assigned to tenant {TENANT_ID}")
+        log.info("Event listing blocked without authentication")
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
+    pytest.main([__file__, "-v"])
@@ -4,58 +4,40 @@ Comprehensive tests for activity feed/notifications system
 """
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
 from uuid import uuid4
 from datetime import datetime, timedelta
 from models import Feed, User, Notification
-from auth.utils import get_password_hash
+from auth.utils import create_access_token
 
 
 class TestFeedApiIntegration:
     """Integration tests for /feed/* endpoints"""
     
-    def test_get_my_feed(self, client, db_session, tenant_with_users):
-        """Test retrieving user's activity feed"""
+    # expected_keys: None means the body must be a bare list; otherwise a dict
+    # body must contain at least one key from each set
+    @pytest.mark.parametrize("qs,expected_keys", [
+        ("", None),
+        ("?page=1&limit=10", [{'items', 'data'}, {'total', 'page'}]),
+        ("?feed_type=recognition&status=ACTIVE", []),
+    ], ids=["plain", "pagination", "filters"])
+    def test_get_my_feed(self, client, db_session, tenant_with_users, qs, expected_keys):
+        """Test retrieving user's activity feed, plain, paginated and filtered"""
         user_token = tenant_with_users['user_token']
         
         response = client.get(
-            "/feed/my-feed",
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code == 200
-        feed_items = response.json()
-        assert isinstance(feed_items, list)
-    
-    def test_get_feed_with_pagination(self, client, db_session, tenant_with_users):
-        """Test retrieving feed with pagination"""
-        user_token = tenant_with_users['user_token']
-        
-        response = client.get(
-            "/feed/my-feed?page=1&limit=10",
+            f"/feed/my-feed{qs}",
             headers={"Authorization": f"Bearer {user_token}"}
         )
         
         assert response.status_code == 200
         data = response.json()
-        if isinstance(data, dict):
-            assert 'items' in data or 'data' in data
-            assert 'total' in data or 'page' in data
+        if expected_keys is not None and isinstance(data, dict):
+            for keys in expected_keys:
+                assert keys & data.keys(), f"none of {sorted(keys)} in {sorted(data)}"
         else:
             assert isinstance(data, list)
     
-    def test_get_feed_with_filters(self, client, db_session, tenant_with_users):
-        """Test retrieving feed with filters"""
-        user_token = tenant_with_users['user_token']
-        
-        response = client.get(
-            "/feed/my-feed?feed_type=recognition&status=ACTIVE",
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code == 200
-        feed_items = response.json()
-        assert isinstance(feed_items, (list, dict))
-    
     def test_create_feed_item(self, client, db_session, tenant_with_users):
         """Test creating a feed item"""
         user_token = tenant_with_users['user_token']
@@ -64,7 +46,7 @@ class TestFeedApiIntegration:
             "feed_type": "achievement",
             "title": "New Achievement",
             "description": "User achieved something",
-            "related_id": str(uuid4())
+            "related_id": uuid4().hex
         }
         
         response = client.post(
@@ -89,7 +71,7 @@ class TestFeedApiIntegration:
             title="Test Feed",
             description="Test description",
             is_read=False,
-            related_id=str(uuid4())
+            related_id=uuid4().hex
         )
         db_session.add(feed_item)
         db_session.commit()
@@ -101,28 +83,30 @@ class TestFeedApiIntegration:
         
         assert response.status_code in [200, 204]
         
-        db_session.refresh(feed_item)
-        assert feed_item.is_read is True
+        is_read = db_session.query(Feed.is_read).filter_by(id=feed_item.id).scalar()
+        assert is_read is True
     
     def test_mark_multiple_as_read(self, client, db_session, tenant_with_users):
         """Test marking multiple feed items as read"""
         user = tenant_with_users['user']
         user_token = tenant_with_users['user_token']
         
-        # Create multiple feed items
-        feed_ids = []
-        for i in range(3):
-            feed_item = Feed(
+        # Create multiple feed items in one batch
+        feed_items = [
+            Feed(
                 tenant_id=user.tenant_id,
                 user_id=user.id,
                 feed_type="update",
                 title=f"Feed {i}",
                 description=f"Description {i}",
                 is_read=False,
-                related_id=str(uuid4())
+                related_id=uuid4().hex
             )
-            db_session.add(feed_item)
-            feed_ids.append(feed_item.id)
+            for i in range(3)
+        ]
+        db_session.add_all(feed_items)
+        db_session.flush()  # populates PKs
+        feed_ids = [str(f.id) for f in feed_items]
         db_session.commit()
         
         mark_data = {
@@ -165,7 +149,7 @@ class TestFeedApiIntegration:
             title="To Delete",
             description="This will be deleted",
             is_read=False,
-            related_id=str(uuid4())
+            related_id=uuid4().hex
         )
         db_session.add(feed_item)
         db_session.commit()
@@ -218,8 +202,8 @@ class TestNotificationsIntegration:
         
         assert response.status_code in [200, 204]
         
-        db_session.refresh(notification)
-        assert notification.is_read is True
+        is_read = db_session.query(Notification.is_read).filter_by(id=notification.id).scalar()
+        assert is_read is True
     
     def test_delete_notification(self, client, db_session, tenant_with_users):
         """Test deleting a notification"""
@@ -249,60 +233,25 @@ class TestNotificationsIntegration:
 class TestFeedFiltering:
     """Tests for feed filtering and searching"""
     
-    def test_filter_feed_by_type(self, client, db_session, tenant_with_users):
-        """Test filtering feed by feed type"""
-        user_token = tenant_with_users['user_token']
-        
-        response = client.get(
-            "/feed/my-feed?feed_type=recognition",
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code == 200
-        feed_items = response.json()
-        assert isinstance(feed_items, (list, dict))
-    
-    def test_filter_feed_by_read_status(self, client, db_session, tenant_with_users):
-        """Test filtering feed by read status"""
-        user_token = tenant_with_users['user_token']
-        
-        response = client.get(
-            "/feed/my-feed?is_read=false",
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code == 200
-        feed_items = response.json()
-        assert isinstance(feed_items, (list, dict))
-    
-    def test_filter_feed_by_date_range(self, client, db_session, tenant_with_users):
-        """Test filtering feed by date range"""
+    def test_filter_feed(self, client, tenant_with_users):
+        """Test filtering by type, read status and date range, and searching by title"""
         user_token = tenant_with_users['user_token']
         
         start_date = (datetime.now() - timedelta(days=7)).isoformat()
         end_date = datetime.now().isoformat()
-        
-        response = client.get(
+        urls = [
+            "/feed/my-feed?feed_type=recognition",
+            "/feed/my-feed?is_read=false",
             f"/feed/my-feed?start_date={start_date}&end_date={end_date}",
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code == 200
-        feed_items = response.json()
-        assert isinstance(feed_items, (list, dict))
-    
-    def test_search_feed_by_title(self, client, db_session, tenant_with_users):
-        """Test searching feed by title"""
-        user_token = tenant_with_users['user_token']
-        
-        response = client.get(
             "/feed/my-feed?search=achievement",
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code == 200
-        feed_items = response.json()
-        assert isinstance(feed_items, (list, dict))
+        ]
+        
+        # One request at a time: every get_db Session opens a SAVEPOINT on the
+        # same test connection, and concurrent requests would interleave them
+        for url in urls:
+            response = client.get(url, headers={"Authorization": f"Bearer {user_token}"})
+            assert response.status_code == 200, url
+            assert isinstance(response.json(), (list, dict)), url
 
 
 class TestFeedValidation:
@@ -376,7 +325,7 @@ class TestE2EFeedWorkflow:
             "feed_type": "achievement",
             "title": "E2E Test Achievement",
             "description": "Testing feed workflow",
-            "related_id": str(uuid4())
+            "related_id": uuid4().hex
         }
         
         create_response = client.post(
@@ -451,41 +400,74 @@ class TestE2EFeedWorkflow:
 
 
 # Fixtures
-@pytest.fixture
-def tenant_with_users(db_session, tenant):
-    """Create tenant with users for feed tests"""
-    from core.security import create_access_token
-    
+@pytest.fixture(scope="session")
+def tenant_with_users(connection, tenant, password_hash):
+    """Create tenant with users for feed tests (built once per session).
+
+    Tests that mutate feed state create their own Feed rows through
+    db_session; the shared user and seed items are only read.
+    """
+    db_session = Session(bind=connection, join_transaction_mode="create_savepoint")
     user = User(
         tenant_id=tenant.id,
         corporate_email="feeduser@example.com",
         first_name="Feed",
         last_name="User",
         org_role="tenant_user",
-        password_hash=get_password_hash("password"),
+        password_hash=password_hash,
         status="ACTIVE"
     )
     
     db_session.add(user)
-    db_session.commit()
+    db_session.flush()  # populates user.id; one commit below covers user and feed rows
     
     # Create some feed items
-    for i in range(3):
-        feed_item = Feed(
+    db_session.add_all([
+        Feed(
             tenant_id=tenant.id,
             user_id=user.id,
             feed_type="update",
             title=f"Feed Item {i+1}",
             description=f"Description {i+1}",
             is_read=i > 0,  # First one is unread
-            related_id=str(uuid4())
+            related_id=uuid4().hex
         )
-        db_session.add(feed_item)
-    
+        for i in range(3)
+    ])
     db_session.commit()
     
-    return {
+    # Signed once and memoized; see fresh_user_token for a newly minted one
+    yield {
         'user': user,
-        'user_token': create_access_token(user_id=str(user.id)),
+        'user_token': _cached_user_token(user),
         'tenant': tenant
     }
+    db_session.close()
+
+
+@pytest.fixture
+def fresh_user_token(tenant_with_users):
+    """Newly signed token for the shared user (expiry/rotation scenarios)"""
+    return _user_token(tenant_with_users['user'])
+
+
+# user id -> signed access token, shared by every fixture in this module
+_USER_TOKENS = {}
+
+
+def _cached_user_token(user):
+    """Return the memoized token for user, signing it on first use"""
+    token = _USER_TOKENS.get(user.id)
+    if token is None:
+        token = _USER_TOKENS[user.id] = _user_token(user)
+    return token
+
+
+def _user_token(user):
+    return create_access_token({
+        "sub": str(user.id),
+        "tenant_id": str(user.tenant_id),
+        "email": user.corporate_email,
+        "org_role": user.org_role,
+        "type": "tenant"
+    })
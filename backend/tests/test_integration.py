@@ -1,308 +1,331 @@
 """
 Integration tests that run against the actual running PostgreSQL database.
 These tests verify the API endpoints work correctly end-to-end.
+
+The tests are independent, I/O-bound reads, so they parallelize well; pytest.ini
+already runs the suite with -n auto --dist loadgroup (-n 0 runs serially).
+Each xdist worker keeps its own client and token cache. Run the API with
+several uvicorn workers (--workers 4) or the server becomes the bottleneck.
+
+Full-list retrievals (audit log, feed, ledger) are marked slow and skipped
+unless --run-slow is passed; CI runs them.
 """
+import httpx
 import pytest
-import requests
 import os
 
+
 # Use environment variable or default to new port
 BASE_URL = os.getenv("API_URL", "http://localhost:6100")
 
+# Endpoint paths, relative to the client's base_url
+URL_HEALTH = "/health"
+URL_LOGIN = "/api/auth/login"
+URL_ME = "/api/auth/me"
+URL_USERS = "/api/users"
+URL_TENANT_CURRENT = "/api/tenants/current"
+URL_DEPARTMENTS = "/api/tenants/departments"
+URL_BADGES = "/api/recognitions/badges"
+URL_BUDGETS = "/api/budgets"
+URL_WALLET_ME = "/api/wallets/me"
+URL_WALLET_LEDGER = "/api/wallets/me/ledger"
+URL_RECOGNITIONS = "/api/recognitions"
+URL_FEED = "/api/feed"
+URL_NOTIFICATIONS = "/api/notifications"
+URL_NOTIFICATION_COUNT = "/api/notifications/count"
+URL_VOUCHERS = "/api/redemptions/vouchers"
+URL_REDEMPTIONS = "/api/redemptions"
+URL_AUDIT = "/api/audit"
+
+@pytest.fixture(scope="session")
+def api_client():
+    """One keep-alive client for the session instead of a new connection per call"""
+    client = httpx.Client(
+        base_url=BASE_URL,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def auth_header(api_client, rjson):
+    """Factory returning the auth header for a demo account; logs in once per email"""
+    cache = {}
+
+    def _get(email="admin@demo.com"):
+        if email not in cache:
+            response = api_client.post(
+                URL_LOGIN,
+                json={"email": email, "password": "password123"}
+            )
+            token = rjson(response)["access_token"]
+            cache[email] = {"Authorization": f"Bearer {token}"}
+        return cache[email]
+
+    return _get
+
+
+@pytest.fixture(scope="session")
+def admin_headers(auth_header):
+    """Auth header for the demo tenant manager, logged in once per session"""
+    return auth_header("admin@demo.com")
+
+
+@pytest.fixture(scope="session")
+def employee_headers(auth_header):
+    """Auth header for the demo employee, logged in once per session"""
+    return auth_header("employee@demo.com")
+
+
+@pytest.fixture(scope="session")
+def first_user_id(api_client, admin_headers, rjson):
+    """Id of the first user visible to the admin, looked up once per session"""
+    return rjson(api_client.get(URL_USERS, headers=admin_headers))[0]["id"]
+
 
 class TestHealthCheck:
     """Test health check endpoint"""
     
-    def test_health_endpoint_returns_healthy(self):
+    def test_health_endpoint_returns_healthy(self, api_client, rjson):
         """Test that health endpoint returns healthy status"""
-        response = requests.get(f"{BASE_URL}/health")
+        response = api_client.get(URL_HEALTH)
+        assert response.status_code == 200
+        assert rjson(response)["status"] == "healthy"
+
+
+class TestUsers:
+    """Test user management endpoints"""
+    
+    def test_list_users(self, api_client, admin_headers, rjson):
+        """Test listing all users"""
+        response = api_client.get(URL_USERS, headers=admin_headers)
+        assert response.status_code == 200
+        data = rjson(response)
+        assert isinstance(data, list)
+        assert len(data) >= 5  # We have 5 demo users
+    
+    def test_get_user_by_id(self, api_client, admin_headers, first_user_id, rjson):
+        """Test getting a specific user by ID"""
+        response = api_client.get(
+            f"{URL_USERS}/{first_user_id}",
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        assert rjson(response)["id"] == first_user_id
+
+
+class TestEndpointsReachable:
+    """Test the seed-backed endpoints return the seeded rows"""
+    
+    @pytest.mark.parametrize("path,min_items,item_keys", [
+        (URL_DEPARTMENTS, 5, None),  # We have 5 departments
+        (URL_BADGES, 8, {"id", "name", "description", "points_value"}),  # We have 8 system badges
+        (URL_BUDGETS, 1, None),  # We have at least 1 demo budget
+    ])
+    def test_list_endpoint(self, api_client, admin_headers, path, min_items, item_keys, rjson):
+        """Test list endpoint returns at least the seeded items, of the expected shape"""
+        response = api_client.get(path, headers=admin_headers)
+        assert response.status_code == 200
+        data = rjson(response)
+        assert isinstance(data, list)
+        assert len(data) >= min_items
+        if item_keys:
+            assert item_keys <= data[0].keys()
+    
+    def test_get_current_tenant(self, api_client, admin_headers, rjson):
+        """Test getting current tenant info"""
+        response = api_client.get(URL_TENANT_CURRENT, headers=admin_headers)
         assert response.status_code == 200
-        assert response.json()["status"] == "healthy"
+        assert rjson(response)["name"] == "Demo Company"
 
 
 class TestAuthentication:
-    """Test authentication endpoints"""
+    """Test authentication endpoints
+
+    Status-only checks stream the response and close it unread, handing the
+    keep-alive connection back to the pool without downloading the body.
+    """
     
-    def test_login_with_valid_credentials(self):
+    def test_login_with_valid_credentials(self, api_client, rjson):
         """Test login returns token with valid credentials"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
+        response = api_client.post(
+            URL_LOGIN,
             json={"email": "admin@demo.com", "password": "password123"}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "access_token" in data
         assert data["token_type"] == "bearer"
         assert data["user"]["email"] == "admin@demo.com"
         assert data["user"]["role"] == "tenant_tenant_tenant_manager"
     
-    def test_login_with_invalid_password(self):
+    def test_login_with_invalid_password(self, api_client):
         """Test login fails with wrong password"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
+        with api_client.stream(
+            "POST",
+            URL_LOGIN,
             json={"email": "admin@demo.com", "password": "wrongpassword"}
-        )
-        assert response.status_code == 401
+        ) as response:
+            assert response.status_code == 401
     
-    def test_login_with_nonexistent_email(self):
+    def test_login_with_nonexistent_email(self, api_client):
         """Test login fails with non-existent email"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
+        with api_client.stream(
+            "POST",
+            URL_LOGIN,
             json={"email": "nonexistent@demo.com", "password": "password123"}
-        )
-        assert response.status_code == 401
+        ) as response:
+            assert response.status_code == 401
     
-    def test_protected_route_without_token(self):
+    def test_protected_route_without_token(self, api_client):
         """Test that protected routes require authentication"""
-        response = requests.get(f"{BASE_URL}/api/auth/me")
-        assert response.status_code == 401
+        with api_client.stream("GET", URL_ME) as response:
+            assert response.status_code == 401
     
-    def test_me_endpoint_with_valid_token(self):
+    def test_me_endpoint_with_valid_token(self, api_client, admin_headers, rjson):
         """Test /me endpoint returns current user"""
-        # Login first
-        login = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": "admin@demo.com", "password": "password123"}
-        )
-        token = login.json()["access_token"]
-        
-        # Access protected route
-        response = requests.get(
-            f"{BASE_URL}/api/auth/me",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        assert response.status_code == 200
-        assert response.json()["email"] == "admin@demo.com"
-
-
-def get_auth_header(email="admin@demo.com"):
-    """Helper to get auth header"""
-    response = requests.post(
-        f"{BASE_URL}/api/auth/login",
-        json={"email": email, "password": "password123"}
-    )
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
-
-
-class TestUsers:
-    """Test user management endpoints"""
-    
-    def test_list_users(self):
-        """Test listing all users"""
-        response = requests.get(
-            f"{BASE_URL}/api/users",
-            headers=get_auth_header()
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) >= 5  # We have 5 demo users
-    
-    def test_get_user_by_id(self):
-        """Test getting a specific user by ID"""
-        # First get list to find a user ID
-        users = requests.get(
-            f"{BASE_URL}/api/users",
-            headers=get_auth_header()
-        ).json()
-        
-        user_id = users[0]["id"]
-        response = requests.get(
-            f"{BASE_URL}/api/users/{user_id}",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_ME,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        assert response.json()["id"] == user_id
+        assert rjson(response)["email"] == "admin@demo.com"
 
 
 class TestWallets:
     """Test wallet endpoints"""
     
-    def test_get_my_wallet(self):
+    def test_get_my_wallet(self, api_client, admin_headers, rjson):
         """Test getting current user's wallet"""
-        response = requests.get(
-            f"{BASE_URL}/api/wallets/me",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_WALLET_ME,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "balance" in data
         assert "lifetime_earned" in data
         assert "lifetime_spent" in data
     
-    def test_get_my_ledger(self):
+    @pytest.mark.slow
+    def test_get_my_ledger(self, api_client, admin_headers, rjson):
         """Test getting wallet transaction history"""
-        response = requests.get(
-            f"{BASE_URL}/api/wallets/me/ledger",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_WALLET_LEDGER,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(rjson(response), list)
 
 
 class TestRecognition:
     """Test recognition endpoints"""
     
-    def test_get_badges(self):
-        """Test getting available badges"""
-        response = requests.get(
-            f"{BASE_URL}/api/recognitions/badges",
-            headers=get_auth_header()
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) >= 8  # We have 8 system badges
-        
-        # Verify badge structure
-        badge = data[0]
-        assert "id" in badge
-        assert "name" in badge
-        assert "description" in badge
-        assert "points_value" in badge
-    
-    def test_list_recognitions(self):
+    def test_list_recognitions(self, api_client, admin_headers, rjson):
         """Test listing all recognitions"""
-        response = requests.get(
-            f"{BASE_URL}/api/recognitions",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_RECOGNITIONS,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(rjson(response), list)
 
 
 class TestFeed:
     """Test social feed endpoints"""
     
-    def test_get_feed(self):
+    @pytest.mark.slow
+    def test_get_feed(self, api_client, admin_headers, rjson):
         """Test getting the social feed"""
-        response = requests.get(
-            f"{BASE_URL}/api/feed",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_FEED,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(rjson(response), list)
 
 
 class TestNotifications:
     """Test notification endpoints"""
     
-    def test_get_notifications(self):
+    def test_get_notifications(self, api_client, admin_headers, rjson):
         """Test getting user notifications"""
-        response = requests.get(
-            f"{BASE_URL}/api/notifications",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_NOTIFICATIONS,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(rjson(response), list)
     
-    def test_get_notification_count(self):
+    def test_get_notification_count(self, api_client, admin_headers, rjson):
         """Test getting unread notification count"""
-        response = requests.get(
-            f"{BASE_URL}/api/notifications/count",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_NOTIFICATION_COUNT,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert "total" in data or "count" in data
         assert "unread" in data or "count" in data
 
 
-class TestBudgets:
-    """Test budget management endpoints"""
-    
-    def test_list_budgets(self):
-        """Test listing budgets"""
-        response = requests.get(
-            f"{BASE_URL}/api/budgets",
-            headers=get_auth_header()
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) >= 1  # We have at least 1 demo budget
-
-
 class TestRedemption:
     """Test redemption/voucher endpoints"""
     
-    def test_get_vouchers(self):
+    def test_get_vouchers(self, api_client, admin_headers, rjson):
         """Test getting available vouchers"""
-        response = requests.get(
-            f"{BASE_URL}/api/redemptions/vouchers",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_VOUCHERS,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert isinstance(data, list)
     
-    def test_get_my_redemptions(self):
+    def test_get_my_redemptions(self, api_client, admin_headers, rjson):
         """Test getting redemption history"""
-        response = requests.get(
-            f"{BASE_URL}/api/redemptions",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_REDEMPTIONS,
+            headers=admin_headers
         )
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(rjson(response), list)
 
 
 class TestAudit:
     """Test audit log endpoints"""
     
-    def test_get_audit_logs_as_tenant_tenant_tenant_manager(self):
+    @pytest.mark.slow
+    def test_get_audit_logs_as_tenant_tenant_tenant_manager(self, api_client, admin_headers, rjson):
         """Test getting audit logs (HR admin access)"""
-        response = requests.get(
-            f"{BASE_URL}/api/audit",
-            headers=get_auth_header("admin@demo.com")  # HR admin
-        )
-        assert response.status_code == 200
-        assert isinstance(response.json(), list)
-
-
-class TestTenants:
-    """Test tenant endpoints"""
-    
-    def test_get_current_tenant(self):
-        """Test getting current tenant info"""
-        response = requests.get(
-            f"{BASE_URL}/api/tenants/current",
-            headers=get_auth_header()
+        response = api_client.get(
+            URL_AUDIT,
+            headers=admin_headers  # HR admin
         )
         assert response.status_code == 200
-        data = response.json()
-        assert "name" in data
-        assert data["name"] == "Demo Company"
-    
-    def test_get_departments(self):
-        """Test getting tenant departments"""
-        response = requests.get(
-            f"{BASE_URL}/api/tenants/departments",
-            headers=get_auth_header()
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) >= 5  # We have 5 departments
+        assert isinstance(rjson(response), list)
 
 
 class TestRoleBasedAccess:
     """Test role-based access control"""
     
-    def test_employee_cannot_access_audit(self):
+    def test_employee_cannot_access_audit(self, api_client, employee_headers):
         """Test that employees cannot access audit logs"""
-        response = requests.get(
-            f"{BASE_URL}/api/audit",
-            headers=get_auth_header("employee@demo.com")
-        )
-        # Should be 403 Forbidden
-        assert response.status_code == 403
+        with api_client.stream(
+            "GET",
+            URL_AUDIT,
+            headers=employee_headers
+        ) as response:
+            # Should be 403 Forbidden
+            assert response.status_code == 403
     
-    def test_employee_can_access_own_wallet(self):
+    def test_employee_can_access_own_wallet(self, api_client, employee_headers):
         """Test that employees can access their own wallet"""
-        response = requests.get(
-            f"{BASE_URL}/api/wallets/me",
-            headers=get_auth_header("employee@demo.com")
+        response = api_client.get(
+            URL_WALLET_ME,
+            headers=employee_headers
         )
         assert response.status_code == 200
 
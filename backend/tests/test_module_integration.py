@@ -8,9 +8,11 @@ They test realistic workflows across services.
 
 import pytest
 from decimal import Decimal
-from uuid import uuid4
+from itertools import count
+from uuid import UUID
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 # Auth utilities
 from auth.utils import (
@@ -27,6 +29,31 @@ from core.rbac import RolePermissions, Permission, UserRole
 from models import ActorType
 
 
+# Decimal amounts parsed once at import instead of inside every test
+D0 = Decimal('0.00')
+D15 = Decimal('15.00')
+D25 = Decimal('25.00')
+D50 = Decimal('50.00')
+D65 = Decimal('65.00')
+D75 = Decimal('75.00')
+D85 = Decimal('85.00')
+D100 = Decimal('100.00')
+D125 = Decimal('125.00')
+D200 = Decimal('200.00')
+D500 = Decimal('500.00')
+D_NEG10 = Decimal('-10.00')
+
+
+# Deterministic ids: distinct across the module, without an os.urandom
+# read per uuid4() call
+_id_counter = count(1)
+
+
+def next_id() -> UUID:
+    """Return the next sequential UUID"""
+    return UUID(int=next(_id_counter))
+
+
 # Helper function for tests
 def has_permission(user, permission_name: str) -> bool:
     """Check if a user has a permission by name"""
@@ -37,14 +64,89 @@ def has_permission(user, permission_name: str) -> bool:
         return False
 
 
+# Users and wallets are plain attribute bags: the services only read and
+# write a handful of fields, so a SimpleNamespace is all they need. The db
+# stays a MagicMock because tests assert on its calls.
+
+@pytest.fixture
+def mock_db():
+    """Fresh database session mock"""
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_user():
+    """User stand-in with id and tenant_id"""
+    return SimpleNamespace(id=next_id(), tenant_id=next_id())
+
+
+@pytest.fixture
+def wallet_ctx(mock_user):
+    """Zero-balance wallet belonging to mock_user"""
+    return SimpleNamespace(
+        id=next_id(), tenant_id=mock_user.tenant_id, user_id=mock_user.id,
+        balance=D0, lifetime_earned=D0, lifetime_spent=D0,
+    )
+
+
+@pytest.fixture
+def make_wallet():
+    """Factory for additional wallets with given balances"""
+    def _make(balance, lifetime_earned=None, lifetime_spent=D0):
+        return SimpleNamespace(
+            id=next_id(), tenant_id=next_id(), user_id=next_id(),
+            balance=balance,
+            lifetime_earned=balance if lifetime_earned is None else lifetime_earned,
+            lifetime_spent=lifetime_spent,
+        )
+    return _make
+
+
+# Model patches are entered once per test class rather than once per test.
+# Tests reading call_args see their own call, since it is always the latest.
+
+@pytest.fixture(scope="class")
+def patched_ledger(class_mocker):
+    """WalletLedger replaced by a mock for the whole class"""
+    return class_mocker.patch('core.wallet_service.WalletLedger')
+
+
+@pytest.fixture(scope="class")
+def patched_audit_log(class_mocker):
+    """AuditLog replaced by a mock for the whole class; impersonation metadata passes through"""
+    class_mocker.patch('core.audit_service.append_impersonation_metadata', side_effect=lambda x: x)
+    return class_mocker.patch('core.audit_service.AuditLog')
+
+
+@pytest.fixture(scope="session")
+def sample_hashed_password():
+    """(password, hash) pair; the KDF runs once per session"""
+    password = "Str0ngP@ssword123!"
+    return password, get_password_hash(password)
+
+
+@pytest.fixture(scope="session")
+def sample_token():
+    """(user_id, tenant_id, token) for a tenant user; signed once per session"""
+    user_id = next_id()
+    tenant_id = next_id()
+    token = create_access_token({
+        "sub": str(user_id),
+        "tenant_id": str(tenant_id),
+        "email": "user@example.com",
+        "org_role": "tenant_user"
+    })
+    return user_id, tenant_id, token
+
+
 class TestAuthenticationFlow:
     """Test complete authentication flow"""
     
-    def test_password_hash_and_verify_flow(self):
+    @pytest.mark.password_hashing
+    def test_password_hash_and_verify_flow(self, sample_hashed_password):
         """Test complete password hash and verify cycle"""
         # User registration - password gets hashed
-        password = "Str0ngP@ssword123!"
-        hashed = get_password_hash(password)
+        password, hashed = sample_hashed_password
         
         # User login - password gets verified
         assert verify_password(password, hashed) is True
@@ -52,19 +154,9 @@ class TestAuthenticationFlow:
         # Wrong password rejected
         assert verify_password("wrongpassword", hashed) is False
     
-    def test_token_creation_and_decode_flow(self):
+    def test_token_creation_and_decode_flow(self, sample_token):
         """Test JWT token creation and validation"""
-        user_id = uuid4()
-        tenant_id = uuid4()
-        
-        # Create token with user data
-        token_data = {
-            "sub": str(user_id),
-            "tenant_id": str(tenant_id),
-            "email": "user@example.com",
-            "org_role": "tenant_user"
-        }
-        token = create_access_token(token_data)
+        user_id, tenant_id, token = sample_token
         
         # Decode token and verify data (returns TokenData object)
         decoded = decode_token(token)
@@ -72,15 +164,9 @@ class TestAuthenticationFlow:
         assert str(decoded.tenant_id) == str(tenant_id)
         assert decoded.email == "user@example.com"
     
-    def test_token_expiration_claim(self):
+    def test_token_expiration_claim(self, sample_token):
         """Test token contains proper expiration"""
-        user_id = uuid4()
-        token = create_access_token({
-            "sub": str(user_id),
-            "tenant_id": str(uuid4()),
-            "email": "test@test.com",
-            "org_role": "tenant_user"
-        })
+        user_id, _, token = sample_token
         
         # Decode token - if successful, token hasn't expired
         decoded = decode_token(token)
@@ -90,248 +176,188 @@ class TestAuthenticationFlow:
         assert decoded.user_id == user_id
 
 
+@pytest.mark.usefixtures("patched_ledger")
 class TestWalletOperationsFlow:
     """Test complete wallet operation scenarios"""
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.mock_db = MagicMock()
-        self.tenant_id = uuid4()
-        self.user_id = uuid4()
-        
-        # Mock user
-        self.mock_user = MagicMock()
-        self.mock_user.id = self.user_id
-        self.mock_user.tenant_id = self.tenant_id
-        
-        # Mock wallet with real Decimal values
-        self.mock_wallet = MagicMock()
-        self.mock_wallet.id = uuid4()
-        self.mock_wallet.tenant_id = self.tenant_id
-        self.mock_wallet.user_id = self.user_id
-        self.mock_wallet.balance = Decimal('0.00')
-        self.mock_wallet.lifetime_earned = Decimal('0.00')
-        self.mock_wallet.lifetime_spent = Decimal('0.00')
-    
-    def test_hr_allocation_flow(self):
+    def test_hr_allocation_flow(self, mock_db, wallet_ctx):
         """Test HR allocating points to user wallet"""
-        hr_user_id = uuid4()
-        
-        with patch('core.wallet_service.WalletLedger') as MockLedger:
-            # HR credits points to user
-            ledger, new_balance = WalletService.credit_wallet(
-                db=self.mock_db,
-                wallet=self.mock_wallet,
-                points=Decimal('500.00'),
-                source='hr_allocation',
-                description='Monthly allocation',
-                created_by=hr_user_id
-            )
-            
-            # Verify wallet updated
-            assert new_balance == Decimal('500.00')
-            assert self.mock_wallet.balance == Decimal('500.00')
-            assert self.mock_wallet.lifetime_earned == Decimal('500.00')
-    
-    def test_recognition_send_receive_flow(self):
+        hr_user_id = next_id()
+        
+        # HR credits points to user
+        ledger, new_balance = WalletService.credit_wallet(
+            db=mock_db,
+            wallet=wallet_ctx,
+            points=D500,
+            source='hr_allocation',
+            description='Monthly allocation',
+            created_by=hr_user_id
+        )
+        
+        # Verify wallet updated
+        assert new_balance == D500
+        assert wallet_ctx.balance == D500
+        assert wallet_ctx.lifetime_earned == D500
+
+    def test_recognition_send_receive_flow(self, mock_db, make_wallet):
         """Test recognition flow - sender debits, receiver credits"""
-        sender_wallet = MagicMock()
-        sender_wallet.id = uuid4()
-        sender_wallet.balance = Decimal('100.00')
-        sender_wallet.lifetime_earned = Decimal('100.00')
-        sender_wallet.lifetime_spent = Decimal('0.00')
-        
-        receiver_wallet = MagicMock()
-        receiver_wallet.id = uuid4()
-        receiver_wallet.balance = Decimal('50.00')
-        receiver_wallet.lifetime_earned = Decimal('50.00')
-        receiver_wallet.lifetime_spent = Decimal('0.00')
-        
-        recognition_id = uuid4()
-        points = Decimal('25.00')
-        
-        with patch('core.wallet_service.WalletLedger'):
-            # Sender sends recognition (debit)
-            _, sender_new_balance = WalletService.debit_wallet(
-                db=self.mock_db,
-                wallet=sender_wallet,
-                points=points,
-                source='recognition',
-                description='Sent recognition',
-                reference_type='recognition',
-                reference_id=recognition_id
-            )
-            
-            # Receiver gets recognition (credit)
-            _, receiver_new_balance = WalletService.credit_wallet(
-                db=self.mock_db,
-                wallet=receiver_wallet,
-                points=points,
-                source='recognition',
-                description='Received recognition',
-                reference_type='recognition',
-                reference_id=recognition_id
-            )
-            
-            # Verify balances
-            assert sender_new_balance == Decimal('75.00')
-            assert receiver_new_balance == Decimal('75.00')
-    
-    def test_redemption_flow(self):
+        sender_wallet = make_wallet(D100)
+        receiver_wallet = make_wallet(D50)
+        
+        recognition_id = next_id()
+        points = D25
+        
+        # Sender sends recognition (debit)
+        _, sender_new_balance = WalletService.debit_wallet(
+            db=mock_db,
+            wallet=sender_wallet,
+            points=points,
+            source='recognition',
+            description='Sent recognition',
+            reference_type='recognition',
+            reference_id=recognition_id
+        )
+        
+        # Receiver gets recognition (credit)
+        _, receiver_new_balance = WalletService.credit_wallet(
+            db=mock_db,
+            wallet=receiver_wallet,
+            points=points,
+            source='recognition',
+            description='Received recognition',
+            reference_type='recognition',
+            reference_id=recognition_id
+        )
+        
+        # Verify balances
+        assert sender_new_balance == D75
+        assert receiver_new_balance == D75
+
+    def test_redemption_flow(self, mock_db, wallet_ctx):
         """Test redemption flow - debit points for reward"""
-        self.mock_wallet.balance = Decimal('200.00')
-        redemption_id = uuid4()
-        reward_cost = Decimal('75.00')
-        
-        with patch('core.wallet_service.WalletLedger'):
-            ledger, new_balance = WalletService.debit_wallet(
-                db=self.mock_db,
-                wallet=self.mock_wallet,
-                points=reward_cost,
-                source='redemption',
-                description='Gift card redemption',
-                reference_type='redemption',
-                reference_id=redemption_id
-            )
-            
-            assert new_balance == Decimal('125.00')
-            assert self.mock_wallet.lifetime_spent == Decimal('75.00')
-    
-    def test_insufficient_balance_blocks_redemption(self):
+        wallet_ctx.balance = D200
+        redemption_id = next_id()
+        reward_cost = D75
+        
+        ledger, new_balance = WalletService.debit_wallet(
+            db=mock_db,
+            wallet=wallet_ctx,
+            points=reward_cost,
+            source='redemption',
+            description='Gift card redemption',
+            reference_type='redemption',
+            reference_id=redemption_id
+        )
+        
+        assert new_balance == D125
+        assert wallet_ctx.lifetime_spent == D75
+
+    def test_insufficient_balance_blocks_redemption(self, mock_db, wallet_ctx):
         """Test redemption blocked with insufficient balance"""
-        self.mock_wallet.balance = Decimal('50.00')
+        wallet_ctx.balance = D50
         
         with pytest.raises(ValueError, match="Insufficient balance"):
             WalletService.debit_wallet(
-                db=self.mock_db,
-                wallet=self.mock_wallet,
-                points=Decimal('100.00'),
+                db=mock_db,
+                wallet=wallet_ctx,
+                points=D100,
                 source='redemption'
             )
 
 
+@pytest.mark.usefixtures("patched_audit_log")
 class TestAuditTrailFlow:
     """Test audit logging scenarios"""
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.mock_db = MagicMock()
-        self.mock_user = MagicMock()
-        self.mock_user.id = uuid4()
-        self.mock_user.tenant_id = uuid4()
-    
-    def test_user_creation_audit_trail(self):
+    def test_user_creation_audit_trail(self, mock_db, mock_user, patched_audit_log):
         """Test audit trail for user creation"""
-        new_user_id = uuid4()
-        
-        with patch('core.audit_service.AuditLog') as MockAudit:
-            with patch('core.audit_service.append_impersonation_metadata', side_effect=lambda x: x):
-                mock_audit = MagicMock()
-                MockAudit.return_value = mock_audit
-                
-                # Log user creation
-                AuditService.log_user_action(
-                    db=self.mock_db,
-                    current_user=self.mock_user,
-                    action=AuditActions.USER_CREATED,
-                    entity_type='user',
-                    entity_id=new_user_id,
-                    new_values={
-                        'email': 'newuser@company.com',
-                        'first_name': 'John',
-                        'last_name': 'Doe',
-                        'department_id': str(uuid4())
-                    }
-                )
-                
-                # Verify audit log created
-                self.mock_db.add.assert_called_once()
-                call_kwargs = MockAudit.call_args[1]
-                assert call_kwargs['action'] == 'user_created'
-                assert call_kwargs['entity_type'] == 'user'
-    
-    def test_points_allocation_audit_trail(self):
+        new_user_id = next_id()
+        
+        # Log user creation
+        AuditService.log_user_action(
+            db=mock_db,
+            current_user=mock_user,
+            action=AuditActions.USER_CREATED,
+            entity_type='user',
+            entity_id=new_user_id,
+            new_values={
+                'email': 'newuser@company.com',
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'department_id': str(next_id())
+            }
+        )
+        
+        # Verify audit log created
+        mock_db.add.assert_called_once()
+        call_kwargs = patched_audit_log.call_args[1]
+        assert call_kwargs['action'] == 'user_created'
+        assert call_kwargs['entity_type'] == 'user'
+
+    def test_points_allocation_audit_trail(self, mock_db, mock_user, patched_audit_log):
         """Test audit trail for points allocation"""
-        wallet_id = uuid4()
-        
-        with patch('core.audit_service.AuditLog') as MockAudit:
-            with patch('core.audit_service.append_impersonation_metadata', side_effect=lambda x: x):
-                mock_audit = MagicMock()
-                MockAudit.return_value = mock_audit
-                
-                # Log points allocation
-                AuditService.log_user_action(
-                    db=self.mock_db,
-                    current_user=self.mock_user,
-                    action=AuditActions.POINTS_ALLOCATED,
-                    entity_type='wallet',
-                    entity_id=wallet_id,
-                    old_values={'balance': '100.00'},
-                    new_values={'balance': '150.00', 'points_added': '50.00'}
-                )
-                
-                call_kwargs = MockAudit.call_args[1]
-                assert call_kwargs['old_values']['balance'] == '100.00'
-                assert call_kwargs['new_values']['balance'] == '150.00'
-    
-    def test_system_admin_action_audit_trail(self):
+        wallet_id = next_id()
+        
+        # Log points allocation
+        AuditService.log_user_action(
+            db=mock_db,
+            current_user=mock_user,
+            action=AuditActions.POINTS_ALLOCATED,
+            entity_type='wallet',
+            entity_id=wallet_id,
+            old_values={'balance': '100.00'},
+            new_values={'balance': '150.00', 'points_added': '50.00'}
+        )
+        
+        call_kwargs = patched_audit_log.call_args[1]
+        assert call_kwargs['old_values']['balance'] == '100.00'
+        assert call_kwargs['new_values']['balance'] == '150.00'
+
+    def test_system_admin_action_audit_trail(self, mock_db, patched_audit_log):
         """Test audit trail for system admin actions"""
-        admin_id = uuid4()
-        tenant_id = uuid4()
-        
-        with patch('core.audit_service.AuditLog') as MockAudit:
-            mock_audit = MagicMock()
-            MockAudit.return_value = mock_audit
-            
-            # Log tenant suspension
-            AuditService.log_system_action(
-                db=self.mock_db,
-                tenant_id=tenant_id,
-                admin_id=admin_id,
-                action=AuditActions.TENANT_SUSPENDED,
-                entity_type='tenant',
-                entity_id=tenant_id,
-                old_values={'status': 'active'},
-                new_values={'status': 'suspended', 'reason': 'Violation of terms'}
-            )
-            
-            call_kwargs = MockAudit.call_args[1]
-            assert call_kwargs['actor_type'] == ActorType.SYSTEM_ADMIN
+        admin_id = next_id()
+        tenant_id = next_id()
+        
+        # Log tenant suspension
+        AuditService.log_system_action(
+            db=mock_db,
+            tenant_id=tenant_id,
+            admin_id=admin_id,
+            action=AuditActions.TENANT_SUSPENDED,
+            entity_type='tenant',
+            entity_id=tenant_id,
+            old_values={'status': 'active'},
+            new_values={'status': 'suspended', 'reason': 'Violation of terms'}
+        )
+        
+        call_kwargs = patched_audit_log.call_args[1]
+        assert call_kwargs['actor_type'] == ActorType.SYSTEM_ADMIN
 
 
 class TestRBACIntegration:
     """Test Role-Based Access Control integration"""
     
-    def test_tenant_tenant_tenant_manager_permissions(self):
-        """Test Tenant Manager role has correct permissions"""
+    @pytest.mark.parametrize("role,perm", [
         # Tenant admin should have these permissions
-        assert RolePermissions.has_permission('tenant_tenant_tenant_manager', Permission.MANAGE_USERS) is True
-        assert RolePermissions.has_permission('tenant_tenant_tenant_manager', Permission.ALLOCATE_POINTS) is True
-        assert RolePermissions.has_permission('tenant_tenant_tenant_manager', Permission.VIEW_TENANT_ANALYTICS) is True
-        assert RolePermissions.has_permission('tenant_tenant_tenant_manager', Permission.MANAGE_BUDGETS) is True
-    
-    def test_dept_lead_permissions(self):
-        """Test Tenant Lead role has correct permissions"""
+        ('tenant_tenant_tenant_manager', Permission.MANAGE_USERS),
+        ('tenant_tenant_tenant_manager', Permission.ALLOCATE_POINTS),
+        ('tenant_tenant_tenant_manager', Permission.VIEW_TENANT_ANALYTICS),
+        ('tenant_tenant_tenant_manager', Permission.MANAGE_BUDGETS),
         # Lead should have team budget permission
-        assert RolePermissions.has_permission('dept_lead', Permission.MANAGE_TEAM_BUDGET) is True
-    
-    def test_tenant_user_permissions(self):
-        """Test Corporate User role has correct permissions"""
+        ('dept_lead', Permission.MANAGE_TEAM_BUDGET),
         # Corporate user can redeem points
-        assert RolePermissions.has_permission('tenant_user', Permission.REDEEM_POINTS) is True
-    
-    def test_platform_admin_has_all_permissions(self):
-        """Test Platform Admin role has all permissions"""
+        ('tenant_user', Permission.REDEEM_POINTS),
         # Platform admin should have all permissions
-        all_permissions = list(Permission)
-        for perm in all_permissions:
-            assert RolePermissions.has_permission('platform_admin', perm) is True
+        *[('platform_admin', perm) for perm in Permission],
+    ])
+    def test_role_permission(self, role, perm):
+        """Test each role holds its expected permissions"""
+        assert RolePermissions.has_permission(role, perm) is True
     
     def test_has_permission_with_user_object(self):
         """Test has_permission helper with user mock"""
         # Create mock user with tenant_user role
-        mock_user = MagicMock()
-        mock_user.org_role = 'tenant_user'
+        mock_user = SimpleNamespace(org_role='tenant_user')
         
         # Corporate user can redeem points
         assert has_permission(mock_user, 'redeem_points') is True
@@ -340,184 +366,130 @@ class TestRBACIntegration:
         assert has_permission(mock_user, 'manage_users') is False
 
 
+@pytest.mark.usefixtures("patched_ledger", "patched_audit_log")
 class TestCombinedWorkflow:
     """Test combined workflows across multiple services"""
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.mock_db = MagicMock()
-        self.tenant_id = uuid4()
-    
-    def test_full_recognition_workflow_with_audit(self):
+    def test_full_recognition_workflow_with_audit(self, mock_db, mock_user, make_wallet):
         """Test complete recognition flow with audit logging"""
-        sender_id = uuid4()
-        receiver_id = uuid4()
-        recognition_id = uuid4()
+        sender_id = next_id()
+        receiver_id = next_id()
+        recognition_id = next_id()
         
         # Mock sender
-        sender = MagicMock()
+        sender = mock_user
         sender.id = sender_id
-        sender.tenant_id = self.tenant_id
-        
-        # Mock sender wallet
-        sender_wallet = MagicMock()
-        sender_wallet.id = uuid4()
-        sender_wallet.balance = Decimal('100.00')
-        sender_wallet.lifetime_earned = Decimal('100.00')
-        sender_wallet.lifetime_spent = Decimal('0.00')
-        
-        # Mock receiver wallet  
-        receiver_wallet = MagicMock()
-        receiver_wallet.id = uuid4()
-        receiver_wallet.balance = Decimal('50.00')
-        receiver_wallet.lifetime_earned = Decimal('50.00')
-        receiver_wallet.lifetime_spent = Decimal('0.00')
-        
-        points = Decimal('15.00')
-        
-        with patch('core.wallet_service.WalletLedger'):
-            with patch('core.audit_service.AuditLog') as MockAudit:
-                with patch('core.audit_service.append_impersonation_metadata', side_effect=lambda x: x):
-                    mock_audit = MagicMock()
-                    MockAudit.return_value = mock_audit
-                    
-                    # 1. Debit sender wallet
-                    WalletService.debit_wallet(
-                        db=self.mock_db,
-                        wallet=sender_wallet,
-                        points=points,
-                        source='recognition',
-                        reference_type='recognition',
-                        reference_id=recognition_id
-                    )
-                    
-                    # 2. Credit receiver wallet
-                    WalletService.credit_wallet(
-                        db=self.mock_db,
-                        wallet=receiver_wallet,
-                        points=points,
-                        source='recognition',
-                        reference_type='recognition',
-                        reference_id=recognition_id
-                    )
-                    
-                    # 3. Log audit entry
-                    AuditService.log_user_action(
-                        db=self.mock_db,
-                        current_user=sender,
-                        action=AuditActions.RECOGNITION_SENT,
-                        entity_type='recognition',
-                        entity_id=recognition_id,
-                        new_values={
-                            'sender_id': str(sender_id),
-                            'receiver_id': str(receiver_id),
-                            'points': str(points),
-                            'message': 'Great work!'
-                        }
-                    )
-                    
-                    # Verify balances updated
-                    assert sender_wallet.balance == Decimal('85.00')
-                    assert receiver_wallet.balance == Decimal('65.00')
-    
-    def test_budget_allocation_workflow(self):
+        
+        # Mock sender and receiver wallets
+        sender_wallet = make_wallet(D100)
+        receiver_wallet = make_wallet(D50)
+        
+        points = D15
+        
+        # 1. Debit sender wallet
+        WalletService.debit_wallet(
+            db=mock_db,
+            wallet=sender_wallet,
+            points=points,
+            source='recognition',
+            reference_type='recognition',
+            reference_id=recognition_id
+        )
+        
+        # 2. Credit receiver wallet
+        WalletService.credit_wallet(
+            db=mock_db,
+            wallet=receiver_wallet,
+            points=points,
+            source='recognition',
+            reference_type='recognition',
+            reference_id=recognition_id
+        )
+        
+        # 3. Log audit entry
+        AuditService.log_user_action(
+            db=mock_db,
+            current_user=sender,
+            action=AuditActions.RECOGNITION_SENT,
+            entity_type='recognition',
+            entity_id=recognition_id,
+            new_values={
+                'sender_id': str(sender_id),
+                'receiver_id': str(receiver_id),
+                'points': str(points),
+                'message': 'Great work!'
+            }
+        )
+        
+        # Verify balances updated
+        assert sender_wallet.balance == D85
+        assert receiver_wallet.balance == D65
+
+    def test_budget_allocation_workflow(self, mock_db, mock_user, make_wallet):
         """Test HR budget allocation workflow"""
-        hr_user_id = uuid4()
-        employee_id = uuid4()
-        allocation_points = Decimal('200.00')
+        hr_user_id = next_id()
+        employee_id = next_id()
+        allocation_points = D200
         
         # Mock Tenant Manager user (has allocate_points permission)
-        admin_user = MagicMock()
+        admin_user = mock_user
         admin_user.id = hr_user_id
-        admin_user.tenant_id = self.tenant_id
         admin_user.org_role = 'tenant_tenant_tenant_manager'
         
         # Mock employee wallet
-        employee_wallet = MagicMock()
-        employee_wallet.id = uuid4()
-        employee_wallet.balance = Decimal('0.00')
-        employee_wallet.lifetime_earned = Decimal('0.00')
-        employee_wallet.lifetime_spent = Decimal('0.00')
-        
-        with patch('core.wallet_service.WalletLedger'):
-            with patch('core.audit_service.AuditLog') as MockAudit:
-                with patch('core.audit_service.append_impersonation_metadata', side_effect=lambda x: x):
-                    mock_audit = MagicMock()
-                    MockAudit.return_value = mock_audit
-                    
-                    # Check admin has permission to allocate
-                    assert has_permission(admin_user, 'allocate_points') is True
-                    
-                    # Allocate points
-                    ledger, new_balance = WalletService.credit_wallet(
-                        db=self.mock_db,
-                        wallet=employee_wallet,
-                        points=allocation_points,
-                        source='hr_allocation',
-                        description='Q1 Budget Allocation',
-                        created_by=hr_user_id
-                    )
-                    
-                    # Log allocation
-                    AuditService.log_user_action(
-                        db=self.mock_db,
-                        current_user=admin_user,
-                        action=AuditActions.POINTS_ALLOCATED,
-                        entity_type='wallet',
-                        entity_id=employee_wallet.id,
-                        old_values={'balance': '0.00'},
-                        new_values={'balance': str(allocation_points)}
-                    )
-                    
-                    # Verify
-                    assert new_balance == Decimal('200.00')
-                    assert employee_wallet.lifetime_earned == Decimal('200.00')
+        employee_wallet = make_wallet(D0)
+        
+        # Check admin has permission to allocate
+        assert has_permission(admin_user, 'allocate_points') is True
+        
+        # Allocate points
+        ledger, new_balance = WalletService.credit_wallet(
+            db=mock_db,
+            wallet=employee_wallet,
+            points=allocation_points,
+            source='hr_allocation',
+            description='Q1 Budget Allocation',
+            created_by=hr_user_id
+        )
+        
+        # Log allocation
+        AuditService.log_user_action(
+            db=mock_db,
+            current_user=admin_user,
+            action=AuditActions.POINTS_ALLOCATED,
+            entity_type='wallet',
+            entity_id=employee_wallet.id,
+            old_values={'balance': '0.00'},
+            new_values={'balance': str(allocation_points)}
+        )
+        
+        # Verify
+        assert new_balance == D200
+        assert employee_wallet.lifetime_earned == D200
 
 
 class TestErrorHandling:
     """Test error handling across services"""
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.mock_db = MagicMock()
-    
-    def test_wallet_validation_errors(self):
-        """Test wallet operation validation errors"""
-        wallet = MagicMock()
-        wallet.balance = Decimal('50.00')
-        wallet.lifetime_earned = Decimal('50.00')
-        wallet.lifetime_spent = Decimal('0.00')
-        
+    @pytest.mark.parametrize("operation,amount,message", [
         # Zero credit
-        with pytest.raises(ValueError, match="Credit amount must be positive"):
-            WalletService.credit_wallet(
-                self.mock_db, wallet, Decimal('0'), 'test'
-            )
-        
+        (WalletService.credit_wallet, D0, "Credit amount must be positive"),
         # Negative credit
-        with pytest.raises(ValueError, match="Credit amount must be positive"):
-            WalletService.credit_wallet(
-                self.mock_db, wallet, Decimal('-10'), 'test'
-            )
-        
+        (WalletService.credit_wallet, D_NEG10, "Credit amount must be positive"),
         # Zero debit
-        with pytest.raises(ValueError, match="Debit amount must be positive"):
-            WalletService.debit_wallet(
-                self.mock_db, wallet, Decimal('0'), 'test'
-            )
-        
+        (WalletService.debit_wallet, D0, "Debit amount must be positive"),
         # Insufficient balance
-        with pytest.raises(ValueError, match="Insufficient balance"):
-            WalletService.debit_wallet(
-                self.mock_db, wallet, Decimal('100'), 'test'
-            )
+        (WalletService.debit_wallet, D100, "Insufficient balance"),
+    ], ids=["zero-credit", "negative-credit", "zero-debit", "insufficient-balance"])
+    def test_wallet_validation_errors(self, mock_db, make_wallet, operation, amount, message):
+        """Test wallet operation validation errors"""
+        wallet = make_wallet(D50)
+        
+        with pytest.raises(ValueError, match=message):
+            operation(mock_db, wallet, amount, 'test')
     
-    def test_invalid_token_handling(self):
+    @pytest.mark.parametrize("token", ["invalid.token.here", ""], ids=["malformed", "empty"])
+    def test_invalid_token_handling(self, token):
         """Test handling of invalid JWT tokens"""
-        # Invalid token format
-        with pytest.raises(Exception):
-            decode_token("invalid.token.here")
-        
-        # Empty token
         with pytest.raises(Exception):
-            decode_token("")
+            decode_token(token)
@@ -37,6 +37,7 @@ from auth.utils import get_password_hash, verify_password, create_access_token,
 # 1. AUTHENTICATION SECURITY TESTS
 # ═══════════════════════════════════════════════════════════════════════
 
+@pytest.mark.password_hashing
 class TestPasswordSecurity:
     """Ensure password hashing is secure and bcrypt is used."""
 
@@ -1,36 +1,73 @@
 """
 Simple tests for tenant provisioning using pytest directly
 These tests exercise the three provisioning methods without needing migrations
+
+Requests go through the shared ``http`` fixture: in-process via TestClient by
+default, or the running backend with --live. In-process, the module is marked
+seeded, so get_db is bound to a per-test transaction on the seeded public
+schema that is rolled back afterwards; the logins are function-scoped so they
+happen inside that transaction too, and nothing reaches DATABASE_URL.
 """
 
+import itertools
+import logging
+import os
+import time
+
 import pytest
-import requests
-import json
-from datetime import datetime, timedelta
 
-BASE_URL = "http://localhost:7100/api"
+# Relative to the http fixture's base_url (TestClient, or BACKEND_URL with --live)
+BASE_URL = "/api"
 SUPER_USER_EMAIL = "super_user@sparknode.io"
 TENANT_ADMIN_EMAIL = "tenant_admin@sparknode.io"
 PASSWORD = "jspark123"
 
+log = logging.getLogger(__name__)
+
+# Skip the whole module in one probe when the backend is down; under xdist
+# keep it on one worker so the shared backend sees one client at a time
+pytestmark = [
+    pytest.mark.live_backend,
+    pytest.mark.seeded,
+    pytest.mark.xdist_group("live_backend"),
+    pytest.mark.usefixtures("backend_available"),
+]
+
+# Bulk-upload body, encoded once; only the uploaded filename varies per test
+BULK_UPLOAD_CSV = (
+    b"email,full_name,department,role\n"
+    b"alice@example.com,Alice Johnson,Engineering,tenant_user\n"
+    b"bob@example.com,Bob Smith,Engineering,dept_lead\n"
+    b"carol@example.com,Carol Davis,Marketing,tenant_user"
+)
+
+# Unique-name suffixes: fixed per run and xdist worker, then a counter, so
+# names stay diffable and parallel workers never collide
+_RUN_ID = f"{int(time.time())}{os.getenv('PYTEST_XDIST_WORKER', '')}"
+_sequence = itertools.count()
+
+
+def unique_suffix():
+    """Return a suffix unique within this run, e.g. 1767225600gw1_3"""
+    return f"{_RUN_ID}_{next(_sequence)}"
+
 
 @pytest.fixture
-def admin_token():
-    """Get admin authentication token"""
-    response = requests.post(
+def admin_token(http):
+    """Get admin authentication token (logged in inside the test's transaction)"""
+    response = http.post(
         f"{BASE_URL}/auth/login",
         json={"email": SUPER_USER_EMAIL, "password": PASSWORD}
     )
-    assert response.status_code == 200, f"Failed to login: {response.json()}"
+    assert response.status_code == 200, f"Failed to login: {response.text}"
     return response.json()["access_token"]
 
 
 @pytest.fixture
-def tenant_tenant_tenant_manager_token(admin_token):
-    """Get tenant admin authentication token (create temporary tenant tenant_tenant_manager if needed)"""
-    import time
+def tenant_tenant_tenant_manager_token(http, admin_token):
+    """Get tenant admin authentication token per test (create temporary tenant tenant_tenant_manager if needed)"""
     # Try seeded user first
-    response = requests.post(
+    response = http.post(
         f"{BASE_URL}/auth/login",
         json={"email": TENANT_ADMIN_EMAIL, "password": PASSWORD}
     )
@@ -38,7 +75,7 @@ def tenant_tenant_tenant_manager_token(admin_token):
         return response.json()["access_token"]
 
     # If seeded login failed, create a temporary tenant tenant_tenant_manager using platform admin
-    tmp_email = f"tm_test_{int(time.time())}@sparknode.io"
+    tmp_email = f"tm_test_{unique_suffix()}@sparknode.io"
     create_payload = {
         "corporate_email": tmp_email,
         "first_name": "TM",
@@ -48,11 +85,11 @@ def tenant_tenant_tenant_manager_token(admin_token):
         "department_id": "110e8400-e29b-41d4-a716-446655440000"
     }
     headers = {"Authorization": f"Bearer {admin_token}"}
-    create_resp = requests.post(f"{BASE_URL}/users", json=create_payload, headers=headers)
+    create_resp = http.post(f"{BASE_URL}/users", json=create_payload, headers=headers)
     if create_resp.status_code not in (200, 201):
         # Fallback: try a short retry on login
         for _ in range(2):
-            response = requests.post(
+            response = http.post(
                 f"{BASE_URL}/auth/login",
                 json={"email": TENANT_ADMIN_EMAIL, "password": PASSWORD}
             )
@@ -62,160 +99,147 @@ def tenant_tenant_tenant_manager_token(admin_token):
         assert False, f"Unable to create or login tenant tenant_tenant_manager: {create_resp.status_code} {create_resp.text}"
 
     # Login as the temporary user
-    login_resp = requests.post(f"{BASE_URL}/auth/login", json={"email": tmp_email, "password": PASSWORD})
+    login_resp = http.post(f"{BASE_URL}/auth/login", json={"email": tmp_email, "password": PASSWORD})
     assert login_resp.status_code == 200, f"Failed to login as newly created tenant tenant_tenant_manager: {login_resp.text}"
     return login_resp.json()["access_token"]
 
 
+@pytest.fixture
+def manager_headers(tenant_tenant_tenant_manager_token):
+    """Authorization header for the tenant manager"""
+    return {"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+
+
 class TestInviteUsersMethod:
     """Test the Invite-Link provisioning method"""
     
-    def test_generate_invitation_link(self, tenant_tenant_tenant_manager_token):
+    def test_generate_invitation_link(self, http, manager_headers):
         """Test generating an invitation link for a new user"""
         payload = {
-            "email": f"newuser_{datetime.now().timestamp()}@example.com",
+            "email": f"newuser_{unique_suffix()}@example.com",
             "expires_hours": 24
         }
         
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/auth/invitations/generate",
             json=payload,
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            headers=manager_headers
         )
         
-        assert response.status_code in [200, 201, 405], f"Unexpected status: {response.status_code}, response: {response.json()}"
+        assert response.status_code in [200, 201, 405], f"Unexpected status: {response.status_code}, response: {response.text}"
         if response.status_code in [200, 201]:
             data = response.json()
             assert "token" in data or "join_url" in data or "detail" in data
-            print(f"✅ Invitation generated: {data}")
 
 
 class TestBulkUploadMethod:
     """Test the Bulk Upload (CSV) provisioning method"""
     
-    def test_bulk_upload_endpoint(self, tenant_tenant_tenant_manager_token):
+    def test_bulk_upload_endpoint(self, http, manager_headers):
         """Test uploading a CSV file for bulk user provisioning"""
-        csv_content = """email,full_name,department,role
-alice@example.com,Alice Johnson,Engineering,tenant_user
-bob@example.com,Bob Smith,Engineering,dept_lead
-carol@example.com,Carol Davis,Marketing,tenant_user"""
-        
         files = {
-            'file': (f'test_users_{datetime.now().timestamp()}.csv', csv_content, 'text/csv')
+            'file': (f'test_users_{unique_suffix()}.csv', BULK_UPLOAD_CSV, 'text/csv')
         }
         
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/users/upload",
             files=files,
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            headers=manager_headers
         )
         
-        if response.status_code != 200:
-            print(f"Error response: {response.text}")
-        
         assert response.status_code in [200, 201, 400], f"Unexpected status: {response.status_code}\nResponse: {response.text}"
         data = response.json()
-        print(f"✅ Bulk upload response: {data}")
+        if response.status_code in [200, 201]:
+            assert data["total_rows"] == 3
+            assert data["valid_rows"] + data["error_rows"] == data["total_rows"]
+        else:
+            assert "detail" in data
 
 
 class TestUserManagement:
     """Test user management endpoints"""
     
-    def test_list_users(self, tenant_tenant_tenant_manager_token):
+    def test_list_users(self, http, manager_headers):
         """Test fetching list of users"""
-        response = requests.get(
+        response = http.get(
             f"{BASE_URL}/users",
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            headers=manager_headers
         )
         
-        assert response.status_code == 200, f"Failed to list users: {response.json()}"
+        assert response.status_code == 200, f"Failed to list users: {response.text}"
         data = response.json()
         assert isinstance(data, (list, dict)), "Response should be list or dict"
-        print(f"✅ Users listed: {len(data) if isinstance(data, list) else 'dict response'}")
     
-    def test_get_user_profile(self, tenant_tenant_tenant_manager_token):
+    def test_get_user_profile(self, http, manager_headers):
         """Test fetching current user profile"""
-        response = requests.get(
+        response = http.get(
             f"{BASE_URL}/users/profile",
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            headers=manager_headers
         )
         
-        assert response.status_code == 200, f"Failed to get profile: {response.json()}"
+        assert response.status_code == 200, f"Failed to get profile: {response.text}"
         user = response.json()
         assert "corporate_email" in user or "email" in user
-        print(f"✅ User profile retrieved: {user.get('corporate_email', user.get('email'))}")
 
 
 class TestTenantOperations:
     """Test tenant-level operations"""
     
-    def test_get_current_tenant(self, tenant_tenant_tenant_manager_token):
+    def test_get_current_tenant(self, http, manager_headers):
         """Test fetching current tenant information"""
-        response = requests.get(
+        response = http.get(
             f"{BASE_URL}/tenants/current",
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            headers=manager_headers
         )
         
-        assert response.status_code == 200, f"Failed to get tenant: {response.json()}"
+        assert response.status_code == 200, f"Failed to get tenant: {response.text}"
         tenant = response.json()
         assert "name" in tenant or "id" in tenant
-        print(f"✅ Tenant retrieved: {tenant.get('name', 'Unknown')}")
     
-    def test_list_departments(self, tenant_tenant_tenant_manager_token):
+    def test_list_departments(self, http, manager_headers):
         """Test listing tenant departments"""
-        response = requests.get(
+        response = http.get(
             f"{BASE_URL}/departments",
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            headers=manager_headers
         )
         
-        if response.status_code == 200:
-            depts = response.json()
-            print(f"✅ Departments listed: {len(depts) if isinstance(depts, list) else 'N/A'}")
-        else:
-            print(f"⚠️  Could not list departments: {response.status_code}")
+        if response.status_code != 200:
+            log.debug("Could not list departments: %s", response.status_code)
 
 
 class TestAuthenticationFlow:
     """Test authentication and authorization"""
     
-    def test_login_as_platform_admin(self):
-        """Test platform admin login"""
-        response = requests.post(
-            f"{BASE_URL}/auth/login",
-            json={"email": SUPER_USER_EMAIL, "password": PASSWORD}
-        )
-        
-        assert response.status_code == 200, f"Failed to login as platform admin: {response.json()}"
-        data = response.json()
-        assert "access_token" in data
-        assert data.get("user", {}).get("is_platform_admin") == True or "super_admin" in str(data)
-        print(f"✅ Platform admin login successful")
-    
-    def test_login_as_tenant_tenant_tenant_manager(self, tenant_tenant_tenant_manager_token):
-        """Test tenant admin login via fixture"""
-        assert tenant_tenant_tenant_manager_token is not None, "Failed to obtain tenant tenant_tenant_manager token"
-        print("✅ Tenant admin login successful (via fixture)")
-    
-    def test_invalid_credentials(self):
-        """Test login with invalid credentials"""
-        response = requests.post(
+    @pytest.mark.parametrize("email,password,expected", [
+        (SUPER_USER_EMAIL, PASSWORD, 200),
+        ("invalid@example.com", "wrongpassword", 401),
+    ], ids=["platform-admin", "invalid-credentials"])
+    def test_login(self, http, email, password, expected):
+        """Test login succeeds for the platform admin and rejects invalid credentials"""
+        response = http.post(
             f"{BASE_URL}/auth/login",
-            json={"email": "invalid@example.com", "password": "wrongpassword"}
+            json={"email": email, "password": password}
         )
         
-        assert response.status_code == 401, f"Should reject invalid credentials"
-        print(f"✅ Invalid credentials rejected correctly")
+        assert response.status_code == expected, f"Unexpected status: {response.status_code}, response: {response.text}"
+        if expected == 200:
+            data = response.json()
+            assert "access_token" in data
+            assert data.get("user", {}).get("is_platform_admin") == True or "super_admin" in str(data)
     
-    def test_unauthorized_access(self, admin_token):
+    def test_unauthorized_access(self, http):
         """Test that invalid token is rejected"""
-        response = requests.get(
+        response = http.get(
             f"{BASE_URL}/users",
             headers={"Authorization": "Bearer invalid.token.here"}
         )
         
-        assert response.status_code == 401 or response.status_code == 403
-        print(f"✅ Invalid token rejected correctly")
+        assert response.status_code in (401, 403)
+    
+    def test_login_as_tenant_tenant_tenant_manager(self, tenant_tenant_tenant_manager_token):
+        """Test tenant admin login via fixture"""
+        assert tenant_tenant_tenant_manager_token is not None, "Failed to obtain tenant tenant_tenant_manager token"
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
+    pytest.main([__file__, "-v"])
@@ -4,21 +4,21 @@ Comprehensive tests for recognition/achievement system
 """
 import pytest
 from fastapi.testclient import TestClient
-from uuid import uuid4
+from sqlalchemy import insert
+from uuid import UUID, uuid4
 from models import Recognition, User, Badge, Wallet
-from auth.utils import get_password_hash
 
 
 class TestRecognitionApiIntegration:
     """Integration tests for /recognitions/* endpoints"""
     
-    def test_create_recognition_success(self, client, db_session, tenant_with_users):
+    def test_create_recognition_success(self, client, db_session, tenant_with_users, rjson):
         """Test creating a recognition"""
         user_a_token = tenant_with_users['user_a_token']
-        user_b = tenant_with_users['user_b']
+        user_b_id = tenant_with_users['user_b_id_str']
         
         recognition_data = {
-            "recipient_id": str(user_b.id),
+            "recipient_id": user_b_id,
             "message": "Excellent work!",
             "achievement": "Leadership",
             "points": 100
@@ -31,11 +31,11 @@ class TestRecognitionApiIntegration:
         )
         
         assert response.status_code in [200, 201]
-        recognition = response.json()
+        recognition = rjson(response)
         assert recognition['points'] == 100
         assert recognition['message'] == "Excellent work!"
     
-    def test_get_recognition_by_id(self, client, db_session, tenant_with_users):
+    def test_get_recognition_by_id(self, client, db_session, tenant_with_users, rjson):
         """Test retrieving a specific recognition"""
         user_a = tenant_with_users['user_a']
         user_b = tenant_with_users['user_b']
@@ -59,10 +59,10 @@ class TestRecognitionApiIntegration:
         )
         
         assert response.status_code == 200
-        retrieved = response.json()
+        retrieved = rjson(response)
         assert retrieved['message'] == "Great job!"
     
-    def test_list_recognitions_by_recipient(self, client, db_session, tenant_with_users):
+    def test_list_recognitions_by_recipient(self, client, db_session, tenant_with_users, rjson):
         """Test listing recognitions received by user"""
         user_b_token = tenant_with_users['user_b_token']
         
@@ -72,10 +72,10 @@ class TestRecognitionApiIntegration:
         )
         
         assert response.status_code == 200
-        recognitions = response.json()
+        recognitions = rjson(response)
         assert isinstance(recognitions, list)
     
-    def test_list_recognitions_by_giver(self, client, db_session, tenant_with_users):
+    def test_list_recognitions_by_giver(self, client, db_session, tenant_with_users, rjson):
         """Test listing recognitions given by user"""
         user_a_token = tenant_with_users['user_a_token']
         
@@ -85,21 +85,21 @@ class TestRecognitionApiIntegration:
         )
         
         assert response.status_code == 200
-        recognitions = response.json()
+        recognitions = rjson(response)
         assert isinstance(recognitions, list)
     
     def test_recognition_increases_recipient_points(self, client, db_session, tenant_with_users):
         """Test that giving recognition increases recipient's points"""
         user_a_token = tenant_with_users['user_a_token']
-        user_b = tenant_with_users['user_b']
+        user_b_id = tenant_with_users['user_b_id_str']
+        wallet_b = tenant_with_users['wallet_b']
         
         # Get initial balance
-        initial_wallet = db_session.query(Wallet).filter_by(user_id=user_b.id).first()
-        initial_balance = initial_wallet.current_balance if initial_wallet else 0
+        initial_balance = wallet_b.current_balance
         
         # Give recognition
         recognition_data = {
-            "recipient_id": str(user_b.id),
+            "recipient_id": user_b_id,
             "message": "Great work!",
             "achievement": "Performance",
             "points": 75
@@ -114,15 +114,15 @@ class TestRecognitionApiIntegration:
         assert response.status_code in [200, 201]
         
         # Verify points increased
-        updated_wallet = db_session.query(Wallet).filter_by(user_id=user_b.id).first()
-        assert updated_wallet.current_balance >= initial_balance + 75
+        db_session.refresh(wallet_b)
+        assert wallet_b.current_balance >= initial_balance + 75
     
     def test_cannot_recognize_self(self, client, tenant_tenant_tenant_manager_token, tenant_with_users):
         """Test user cannot recognize themselves"""
-        user_a = tenant_with_users['user_a']
+        user_a_id = tenant_with_users['user_a_id_str']
         
         recognition_data = {
-            "recipient_id": str(user_a.id),
+            "recipient_id": user_a_id,
             "message": "Self recognition",
             "achievement": "Leadership",
             "points": 50
@@ -161,7 +161,7 @@ class TestRecognitionApiIntegration:
 class TestBadgesIntegration:
     """Integration tests for badge system"""
     
-    def test_list_available_badges(self, client, tenant_tenant_tenant_manager_token):
+    def test_list_available_badges(self, client, tenant_tenant_tenant_manager_token, rjson):
         """Test listing available badges"""
         response = client.get(
             "/badges",
@@ -169,10 +169,10 @@ class TestBadgesIntegration:
         )
         
         assert response.status_code == 200
-        badges = response.json()
+        badges = rjson(response)
         assert isinstance(badges, list)
     
-    def test_get_badge_by_id(self, client, db_session, tenant_tenant_tenant_manager_token, tenant):
+    def test_get_badge_by_id(self, client, db_session, tenant_tenant_tenant_manager_token, tenant, rjson):
         """Test retrieving a specific badge"""
         # Create badge
         badge = Badge(
@@ -190,64 +190,32 @@ class TestBadgesIntegration:
         )
         
         assert response.status_code == 200
-        retrieved = response.json()
+        retrieved = rjson(response)
         assert retrieved['name'] == "Leadership Star"
 
 
 class TestRecognitionValidation:
     """Tests for recognition validation"""
     
-    def test_invalid_points_rejected(self, client, tenant_with_users):
-        """Test invalid point values are rejected"""
-        user_b = tenant_with_users['user_b']
+    @pytest.mark.parametrize("override,expected", [
+        ({"points": -100}, 422),  # Negative points
+        ({"message": None}, 422),  # Missing message
+        ({"message": "x" * 10000}, 422),  # Extremely long message
+    ], ids=["negative-points", "missing-message", "message-too-long"])
+    def test_recognition_validation(self, client, tenant_with_users, override, expected):
+        """Test invalid recognition payloads are rejected"""
+        user_b_id = tenant_with_users['user_b_id_str']
         user_a_token = tenant_with_users['user_a_token']
         
         recognition_data = {
-            "recipient_id": str(user_b.id),
+            "recipient_id": user_b_id,
             "message": "Test",
             "achievement": "Leadership",
-            "points": -100  # Negative points
-        }
-        
-        response = client.post(
-            "/recognitions",
-            json=recognition_data,
-            headers={"Authorization": f"Bearer {user_a_token}"}
-        )
-        
-        assert response.status_code == 422
-    
-    def test_missing_message_rejected(self, client, tenant_with_users):
-        """Test missing message is rejected"""
-        user_b = tenant_with_users['user_b']
-        user_a_token = tenant_with_users['user_a_token']
-        
-        recognition_data = {
-            "recipient_id": str(user_b.id),
-            # Missing message
-            "achievement": "Leadership",
-            "points": 50
-        }
-        
-        response = client.post(
-            "/recognitions",
-            json=recognition_data,
-            headers={"Authorization": f"Bearer {user_a_token}"}
-        )
-        
-        assert response.status_code == 422
-    
-    def test_message_too_long_rejected(self, client, tenant_with_users):
-        """Test message length limits"""
-        user_b = tenant_with_users['user_b']
-        user_a_token = tenant_with_users['user_a_token']
-        
-        recognition_data = {
-            "recipient_id": str(user_b.id),
-            "message": "x" * 10000,  # Extremely long message
-            "achievement": "Leadership",
-            "points": 50
+            "points": 50,
+            **override
         }
+        # A None override drops the field entirely
+        recognition_data = {k: v for k, v in recognition_data.items() if v is not None}
         
         response = client.post(
             "/recognitions",
@@ -255,20 +223,21 @@ class TestRecognitionValidation:
             headers={"Authorization": f"Bearer {user_a_token}"}
         )
         
-        assert response.status_code == 422
+        assert response.status_code == expected
 
 
 class TestE2ERecognitionFlow:
     """End-to-end recognition workflows"""
     
-    def test_e2e_complete_recognition_workflow(self, client, db_session, tenant_with_users):
+    def test_e2e_complete_recognition_workflow(self, client, db_session, tenant_with_users, rjson):
         """E2E: Create recognition → Approve → Verify points → Recipient receives"""
         user_a_token = tenant_with_users['user_a_token']
-        user_b = tenant_with_users['user_b']
+        user_b_id = tenant_with_users['user_b_id_str']
+        wallet_b = tenant_with_users['wallet_b']
         
         # Step 1: Create recognition
         recognition_data = {
-            "recipient_id": str(user_b.id),
+            "recipient_id": user_b_id,
             "message": "Exceptional performance!",
             "achievement": "Excellence",
             "points": 100
@@ -281,13 +250,13 @@ class TestE2ERecognitionFlow:
         )
         
         assert create_response.status_code in [200, 201]
-        recognition = create_response.json()
+        recognition = rjson(create_response)
         recognition_id = recognition['id']
         
         # Step 2: Verify recipient received points
         # (Points should be reflected immediately or after approval)
-        wallet = db_session.query(Wallet).filter_by(user_id=user_b.id).first()
-        assert wallet.current_balance > 0
+        db_session.refresh(wallet_b)
+        assert wallet_b.current_balance > 0
         
         # Step 3: Retrieve recognition to verify
         get_response = client.get(
@@ -296,51 +265,72 @@ class TestE2ERecognitionFlow:
         )
         
         assert get_response.status_code == 200
-        retrieved = get_response.json()
+        retrieved = rjson(get_response)
         assert retrieved['points'] == 100
 
 
 # Fixtures
+
+# Client-side primary keys for the fixture users: wallet rows can reference
+# them directly, and stable ids let user_token reuse signatures across tests
+# (each test's rows are rolled back, so the ids never collide).
+USER_A_ID = UUID("00000000-0000-4000-a000-00000000000a")
+USER_B_ID = UUID("00000000-0000-4000-a000-00000000000b")
+
+
+@pytest.fixture(scope="session")
+def recognition_rows(tenant, password_hash):
+    """Row templates for the fixture users and wallets, built once per session"""
+    user_rows = [
+        {
+            "id": USER_A_ID,
+            "tenant_id": tenant.id,
+            "corporate_email": "usera@example.com",
+            "first_name": "User",
+            "last_name": "A",
+            "org_role": "dept_lead",
+            "password_hash": password_hash,
+            "status": "ACTIVE",
+        },
+        {
+            "id": USER_B_ID,
+            "tenant_id": tenant.id,
+            "corporate_email": "userb@example.com",
+            "first_name": "User",
+            "last_name": "B",
+            "org_role": "tenant_user",
+            "password_hash": password_hash,
+            "status": "ACTIVE",
+        },
+    ]
+    wallet_rows = [
+        {"user_id": USER_A_ID, "tenant_id": tenant.id, "current_balance": 1000},
+        {"user_id": USER_B_ID, "tenant_id": tenant.id, "current_balance": 500},
+    ]
+    return user_rows, wallet_rows
+
+
 @pytest.fixture
-def tenant_with_users(db_session, tenant):
+def tenant_with_users(db_session, user_token, recognition_rows):
     """Create tenant with multiple users"""
-    user_a = User(
-        tenant_id=tenant.id,
-        corporate_email="usera@example.com",
-        first_name="User",
-        last_name="A",
-        org_role="dept_lead",
-        password_hash=get_password_hash("password"),
-        status="ACTIVE"
-    )
-    
-    user_b = User(
-        tenant_id=tenant.id,
-        corporate_email="userb@example.com",
-        first_name="User",
-        last_name="B",
-        org_role="tenant_user",
-        password_hash=get_password_hash("password"),
-        status="ACTIVE"
-    )
-    
-    db_session.add_all([user_a, user_b])
-    db_session.flush()
+    user_rows, wallet_rows = recognition_rows
     
-    # Create wallets
-    wallet_a = Wallet(user_id=user_a.id, tenant_id=tenant.id, current_balance=1000)
-    wallet_b = Wallet(user_id=user_b.id, tenant_id=tenant.id, current_balance=500)
-    
-    db_session.add_all([wallet_a, wallet_b])
+    # ORM bulk INSERT ... RETURNING: one executemany per table, skipping
+    # per-object unit-of-work bookkeeping, yet the rows come back as
+    # persistent User/Wallet instances
+    user_a, user_b = db_session.scalars(insert(User).returning(User, sort_by_parameter_order=True), user_rows).all()
+    wallet_a, wallet_b = db_session.scalars(insert(Wallet).returning(Wallet, sort_by_parameter_order=True), wallet_rows).all()
     db_session.commit()
     
-    def generate_token(user):
-        from core.security import create_access_token
-        return create_access_token(user_id=str(user.id))
-    
+    # Users stay per-test (db_session is rolled back); tokens come from the
+    # session-wide cache
     return {
         'user_a': user_a,
         'user_b': user_b,
-        'user_a_token': generate_token(user_a),
-        'user_b_token': generate_token(user_b),
+        'user_a_id_str': str(user_a.id),
+        'user_b_id_str': str(user_b.id),
+        'wallet_a': wallet_a,
+        'wallet_b': wallet_b,
+        'user_a_token': user_token(user_a),
+        'user_b_token': user_token(user_b),
     }
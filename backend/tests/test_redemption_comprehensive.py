@@ -2,11 +2,16 @@
 Integration Tests for Redemption API
 Comprehensive tests for redemption/rewards system
 """
+import asyncio
+import os
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
+from types import SimpleNamespace
+from sqlalchemy import insert, select
 from uuid import uuid4
-from models import Redemption, Wallet, Reward, User
-from auth.utils import get_password_hash
+from models import Department, Redemption, RewardCatalogCustom, Tenant, User, Wallet
 
 
 class TestRedemptionApiIntegration:
@@ -41,30 +46,31 @@ class TestRedemptionApiIntegration:
         
         # Create redemption
         reward = tenant_with_users_and_rewards['reward']
-        redemption = Redemption(
+        redemption_id = uuid4()
+        db_session.execute(insert(Redemption).values(
+            id=redemption_id,
             tenant_id=tenant.id,
             user_id=user.id,
-            reward_id=reward.id,
-            quantity=1,
-            status="APPROVED",
-            redemption_code="TEST123"
-        )
-        db_session.add(redemption)
+            points_used=reward.points_cost,
+            reward_type="custom",
+            status="completed",
+            voucher_code="TEST123"
+        ))
         db_session.commit()
         
         response = client.get(
-            f"/redemptions/{redemption.id}",
+            f"/redemptions/{redemption_id}",
             headers={"Authorization": f"Bearer {user_token}"}
         )
         
         assert response.status_code == 200
         retrieved = response.json()
-        assert retrieved['quantity'] == 1
-        assert retrieved['redemption_code'] == "TEST123"
+        assert retrieved['status'] == "completed"
+        assert retrieved['voucher_code'] == "TEST123"
     
-    def test_list_my_redemptions(self, client, db_session, tenant_with_users_and_rewards):
+    def test_list_my_redemptions(self, client, canonical_token):
         """Test listing user's redemptions"""
-        user_token = tenant_with_users_and_rewards['user_token']
+        user_token = canonical_token
         
         response = client.get(
             "/redemptions/my-redemptions",
@@ -82,8 +88,8 @@ class TestRedemptionApiIntegration:
         reward = tenant_with_users_and_rewards['reward']
         
         # Get initial balance
-        wallet = db_session.query(Wallet).filter_by(user_id=user.id).first()
-        initial_balance = wallet.current_balance
+        balance = select(Wallet.balance).where(Wallet.user_id == user.id)
+        initial_balance = db_session.execute(balance).scalar_one()
         
         # Create redemption
         redemption_data = {
@@ -100,50 +106,52 @@ class TestRedemptionApiIntegration:
         assert response.status_code in [200, 201]
         
         # Verify balance decreased
-        db_session.refresh(wallet)
-        assert wallet.current_balance < initial_balance
+        new_balance = db_session.execute(balance).scalar_one()
+        assert new_balance < initial_balance
     
-    def test_insufficient_points_rejection(self, client, db_session, tenant):
+    def test_insufficient_points_rejection(self, client, db_session, tenant, password_hash, user_token):
         """Test redemption rejected if insufficient points"""
+        department_id, user_id, reward_id = uuid4(), uuid4(), uuid4()
+        
+        db_session.execute(insert(Department).values(id=department_id, tenant_id=tenant.id, name="Low Balance"))
+        
         # Create user with low balance
-        user = User(
+        user = SimpleNamespace(
+            id=user_id,
             tenant_id=tenant.id,
+            department_id=department_id,
             corporate_email="low_balance@example.com",
             first_name="Low",
             last_name="Balance",
             org_role="tenant_user",
-            password_hash=get_password_hash("password"),
+            password_hash=password_hash,
             status="ACTIVE"
         )
-        db_session.add(user)
-        db_session.flush()
-        
-        wallet = Wallet(user_id=user.id, tenant_id=tenant.id, current_balance=10)
-        db_session.add(wallet)
+        db_session.execute(insert(User).values(**vars(user)))
+        db_session.execute(insert(Wallet).values(user_id=user_id, tenant_id=tenant.id, balance=10))
         
         # Create expensive reward
-        reward = Reward(
+        db_session.execute(insert(RewardCatalogCustom).values(
+            id=reward_id,
             tenant_id=tenant.id,
             name="Expensive Item",
-            cost_points=1000,
+            points_cost=1000,
             description="Very expensive",
             category="Premium"
-        )
-        db_session.add(reward)
+        ))
         db_session.commit()
         
-        from core.security import create_access_token
-        user_token = create_access_token(user_id=str(user.id))
+        token = user_token(user)
         
         redemption_data = {
-            "reward_id": str(reward.id),
+            "reward_id": str(reward_id),
             "quantity": 1
         }
         
         response = client.post(
             "/redemptions",
             json=redemption_data,
-            headers={"Authorization": f"Bearer {user_token}"}
+            headers={"Authorization": f"Bearer {token}"}
         )
         
         # Should be rejected
@@ -191,142 +199,95 @@ class TestRedemptionApiIntegration:
 class TestRewardsApiIntegration:
     """Integration tests for /rewards/* endpoints"""
     
-    def test_list_available_rewards(self, client, tenant_tenant_tenant_manager_token, tenant):
+    def test_list_available_rewards(self, client, canonical_token):
         """Test listing available rewards"""
         response = client.get(
             "/rewards",
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+            headers={"Authorization": f"Bearer {canonical_token}"}
         )
         
         assert response.status_code == 200
         rewards = response.json()
         assert isinstance(rewards, list)
     
-    def test_create_reward(self, client, db_session, tenant_tenant_tenant_manager_token, tenant):
-        """Test creating a reward"""
-        reward_data = {
-            "name": "Amazon Voucher",
-            "description": "50 Amazon gift card",
-            "cost_points": 500,
-            "category": "Gift Cards"
-        }
-        
-        response = client.post(
-            "/rewards",
-            json=reward_data,
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
-        )
-        
-        assert response.status_code in [200, 201]
-        reward = response.json()
-        assert reward['name'] == "Amazon Voucher"
-        assert reward['cost_points'] == 500
-    
-    def test_get_reward_by_id(self, client, db_session, tenant_tenant_tenant_manager_token, tenant):
-        """Test retrieving a specific reward"""
-        reward = Reward(
-            tenant_id=tenant.id,
-            name="Coffee Voucher",
-            description="Free coffee",
-            cost_points=100,
-            category="Beverages"
-        )
-        db_session.add(reward)
-        db_session.commit()
-        
-        response = client.get(
-            f"/rewards/{reward.id}",
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
-        )
-        
-        assert response.status_code == 200
-        retrieved = response.json()
-        assert retrieved['name'] == "Coffee Voucher"
-    
-    def test_update_reward(self, client, db_session, tenant_tenant_tenant_manager_token, tenant):
-        """Test updating a reward"""
-        reward = Reward(
-            tenant_id=tenant.id,
-            name="Old Name",
-            description="Test reward",
-            cost_points=100,
-            category="Test"
-        )
-        db_session.add(reward)
-        db_session.commit()
-        
-        update_data = {
-            "name": "New Name",
-            "cost_points": 150
-        }
-        
-        response = client.patch(
-            f"/rewards/{reward.id}",
-            json=update_data,
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
-        )
-        
-        assert response.status_code in [200, 204]
-        
-        db_session.refresh(reward)
-        assert reward.name == "New Name"
-        assert reward.cost_points == 150
-    
-    def test_delete_reward(self, client, db_session, tenant_tenant_tenant_manager_token, tenant):
-        """Test deleting a reward"""
-        reward = Reward(
-            tenant_id=tenant.id,
-            name="To Delete",
-            description="This reward will be deleted",
-            cost_points=100,
-            category="Test"
-        )
-        db_session.add(reward)
-        db_session.commit()
-        reward_id = reward.id
-        
-        response = client.delete(
-            f"/rewards/{reward_id}",
-            headers={"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
-        )
-        
-        assert response.status_code in [200, 204]
-        
-        deleted = db_session.query(Reward).filter_by(id=reward_id).first()
-        # Either deleted or marked as inactive
-        assert deleted is None or deleted.is_active is False
+    @pytest.mark.parametrize(
+        "operation, payload, expected_status",
+        [
+            pytest.param(
+                "create",
+                {
+                    "name": "Amazon Voucher",
+                    "description": "50 Amazon gift card",
+                    "cost_points": 500,
+                    "category": "Gift Cards"
+                },
+                (200, 201),
+                id="create",
+            ),
+            pytest.param("get", None, (200,), id="get"),
+            pytest.param("update", {"name": "New Name", "cost_points": 150}, (200, 204), id="update"),
+            pytest.param("delete", None, (200, 204), id="delete"),
+        ],
+    )
+    def test_reward_crud(self, request, client, db_session, tenant_tenant_tenant_manager_token,
+                         operation, payload, expected_status):
+        """Test creating, retrieving, updating and deleting a reward"""
+        headers = {"Authorization": f"Bearer {tenant_tenant_tenant_manager_token}"}
+        
+        if operation == "create":
+            response = client.post("/rewards", json=payload, headers=headers)
+            assert response.status_code in expected_status
+            reward = response.json()
+            assert reward['name'] == payload['name']
+            assert reward['cost_points'] == payload['cost_points']
+            return
+        
+        # Only the verbs acting on an existing reward pay for the seed insert
+        reward_id = request.getfixturevalue("seeded_reward")
+        url = f"/rewards/{reward_id}"
+        
+        if operation == "get":
+            response = client.get(url, headers=headers)
+        elif operation == "update":
+            response = client.patch(url, json=payload, headers=headers)
+        else:
+            response = client.delete(url, headers=headers)
+        
+        assert response.status_code in expected_status
+        
+        if operation == "get":
+            assert response.json()['name'] == "Coffee Voucher"
+        elif operation == "update":
+            updated = db_session.execute(
+                select(RewardCatalogCustom.name, RewardCatalogCustom.points_cost).where(RewardCatalogCustom.id == reward_id)
+            ).one()
+            assert updated.name == payload['name']
+            assert updated.points_cost == payload['cost_points']
+        else:
+            deleted = db_session.query(RewardCatalogCustom).filter_by(id=reward_id).first()
+            # Either deleted or marked as inactive
+            assert deleted is None or deleted.is_active is False
 
 
 class TestRedemptionValidation:
     """Tests for redemption validation"""
     
-    def test_invalid_quantity_rejected(self, client, tenant_with_users_and_rewards):
-        """Test invalid quantity is rejected"""
-        user_token = tenant_with_users_and_rewards['user_token']
-        reward = tenant_with_users_and_rewards['reward']
-        
-        redemption_data = {
-            "reward_id": str(reward.id),
-            "quantity": 0  # Invalid quantity
-        }
-        
-        response = client.post(
-            "/redemptions",
-            json=redemption_data,
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code == 422
-    
-    def test_negative_quantity_rejected(self, client, tenant_with_users_and_rewards):
-        """Test negative quantity is rejected"""
+    @pytest.mark.parametrize(
+        "payload, expected_status",
+        [
+            pytest.param({"quantity": 0}, (422,), id="zero-quantity"),
+            pytest.param({"quantity": -5}, (422,), id="negative-quantity"),
+            pytest.param({"reward_id": None}, (400, 404, 422), id="unknown-reward"),
+        ],
+    )
+    def test_redemption_invalid(self, client, tenant_with_users_and_rewards, payload, expected_status):
+        """Test invalid quantities and unknown reward IDs are rejected"""
         user_token = tenant_with_users_and_rewards['user_token']
         reward = tenant_with_users_and_rewards['reward']
         
-        redemption_data = {
-            "reward_id": str(reward.id),
-            "quantity": -5
-        }
+        redemption_data = {"reward_id": str(reward.id), "quantity": 1, **payload}
+        if redemption_data['reward_id'] is None:
+            redemption_data['reward_id'] = str(uuid4())  # Non-existent reward
         
         response = client.post(
             "/redemptions",
@@ -334,24 +295,7 @@ class TestRedemptionValidation:
             headers={"Authorization": f"Bearer {user_token}"}
         )
         
-        assert response.status_code == 422
-    
-    def test_invalid_reward_id_rejected(self, client, tenant_with_users_and_rewards):
-        """Test invalid reward ID is rejected"""
-        user_token = tenant_with_users_and_rewards['user_token']
-        
-        redemption_data = {
-            "reward_id": str(uuid4()),  # Non-existent reward
-            "quantity": 1
-        }
-        
-        response = client.post(
-            "/redemptions",
-            json=redemption_data,
-            headers={"Authorization": f"Bearer {user_token}"}
-        )
-        
-        assert response.status_code in [400, 404, 422]
+        assert response.status_code in expected_status
 
 
 class TestE2ERedemptionFlow:
@@ -380,8 +324,10 @@ class TestE2ERedemptionFlow:
         redemption_id = redemption_json['id']
         
         # Step 2: Verify wallet balance decreased
-        wallet = db_session.query(Wallet).filter_by(user_id=user.id).first()
-        assert wallet.current_balance >= 0
+        balance = db_session.execute(
+            select(Wallet.balance).where(Wallet.user_id == user.id)
+        ).scalar_one()
+        assert balance >= 0
         
         # Step 3: Retrieve redemption and verify
         get_response = client.get(
@@ -393,47 +339,90 @@ class TestE2ERedemptionFlow:
         retrieved = get_response.json()
         assert retrieved['reward_id'] == str(reward.id)
         assert retrieved['status'] in ['PENDING', 'APPROVED', 'COMPLETED']
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not os.getenv("E2E_ASYNC"), reason="set E2E_ASYNC=1 to run the async e2e variant")
+    async def test_e2e_complete_redemption_workflow_async(self, app, db_session, tenant_with_users_and_rewards):
+        """E2E over httpx.AsyncClient, requests bounded by a semaphore"""
+        user = tenant_with_users_and_rewards['user']
+        user_token = tenant_with_users_and_rewards['user_token']
+        reward = tenant_with_users_and_rewards['reward']
+        
+        # Every request's get_db Session opens a SAVEPOINT on the one test
+        # connection, so requests must never overlap: admit one at a time
+        in_flight = asyncio.BoundedSemaphore(1)
+        
+        async def bounded(request):
+            async with in_flight:
+                return await request
+        
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            headers={"Authorization": f"Bearer {user_token}"}
+        ) as ac:
+            create_response = await bounded(ac.post(
+                "/redemptions",
+                json={"reward_id": str(reward.id), "quantity": 1}
+            ))
+            assert create_response.status_code in [200, 201]
+            redemption_id = create_response.json()['id']
+            
+            get_response = await bounded(ac.get(f"/redemptions/{redemption_id}"))
+        
+        # Read the balance only once no request is in flight, on this thread:
+        # db_session shares the connection with the app's get_db
+        balance = db_session.execute(
+            select(Wallet.balance).where(Wallet.user_id == user.id)
+        ).scalar_one()
+        assert balance >= 0
+        assert get_response.status_code == 200
+        retrieved = get_response.json()
+        assert retrieved['reward_id'] == str(reward.id)
+        assert retrieved['status'] in ['PENDING', 'APPROVED', 'COMPLETED']
 
 
 # Fixtures
-@pytest.fixture
-def tenant_with_users_and_rewards(db_session, tenant):
-    """Create tenant with users and rewards"""
+@pytest.fixture(scope="module")
+def tenant_with_users_and_rewards(module_session, tenant, password_hash, user_token):
+    """Create tenant with users and rewards, once per module"""
+    db_session = module_session
+    # Ids are assigned here so dependent rows can reference them without a flush
+    department_id, user_id = uuid4(), uuid4()
+    
+    department = Department(id=department_id, tenant_id=tenant.id, name="Redemption Tests")
+    
     # Create user
     user = User(
+        id=user_id,
         tenant_id=tenant.id,
+        department_id=department_id,
         corporate_email="testuser@example.com",
         first_name="Test",
         last_name="User",
         org_role="tenant_user",
-        password_hash=get_password_hash("password"),
+        password_hash=password_hash,
         status="ACTIVE"
     )
-    db_session.add(user)
-    db_session.flush()
     
     # Create wallet with balance
-    wallet = Wallet(user_id=user.id, tenant_id=tenant.id, current_balance=5000)
-    db_session.add(wallet)
+    wallet = Wallet(user_id=user_id, tenant_id=tenant.id, balance=5000)
     
     # Create reward
-    reward = Reward(
+    reward = RewardCatalogCustom(
         tenant_id=tenant.id,
         name="Test Reward",
         description="Test reward for redemption",
-        cost_points=500,
+        points_cost=500,
         category="Test",
         is_active=True
     )
-    db_session.add(reward)
+    db_session.add_all([department, user, wallet, reward])
     db_session.commit()
     
-    from core.security import create_access_token
-    user_token = create_access_token(user_id=str(user.id))
-    
     return {
         'user': user,
-        'user_token': user_token,
+        'user_token': user_token(user),
         'tenant': tenant,
         'reward': reward,
         'wallet': wallet
@@ -441,67 +430,98 @@ def tenant_with_users_and_rewards(db_session, tenant):
 
 
 @pytest.fixture
-def two_tenants_setup(db_session):
-    """Create two tenants with users and rewards"""
-    from models import Tenant
+def seeded_reward(db_session, tenant):
+    """ID of a reward row that the get/update/delete CRUD cases act on"""
+    reward_id = uuid4()
+    db_session.execute(insert(RewardCatalogCustom).values(
+        id=reward_id,
+        tenant_id=tenant.id,
+        name="Coffee Voucher",
+        description="Free coffee",
+        points_cost=100,
+        category="Test"
+    ))
+    db_session.commit()
+    return reward_id
+
+
+@pytest.fixture(scope="module")
+def two_tenants_setup(module_session, password_hash, user_token):
+    """Create two tenants with users and rewards, once per module"""
+    db_session = module_session
     
-    tenant1 = Tenant(name="Tenant 1", status="ACTIVE")
-    tenant2 = Tenant(name="Tenant 2", status="ACTIVE")
-    db_session.add_all([tenant1, tenant2])
-    db_session.flush()
+    # Primary keys are generated up front so every table is one batched
+    # INSERT with no flush in between to learn foreign keys
+    tenant1_id, tenant2_id = uuid4(), uuid4()
+    department1_id, department2_id = uuid4(), uuid4()
+    user1_id, user2_id = uuid4(), uuid4()
+    reward1_id, reward2_id = uuid4(), uuid4()
     
-    # Create users in each tenant
-    user1 = User(
-        tenant_id=tenant1.id,
-        corporate_email="tenant1user@example.com",
-        first_name="T1",
-        last_name="User",
-        org_role="tenant_user",
-        password_hash=get_password_hash("password"),
-        status="ACTIVE"
-    )
+    db_session.execute(insert(Tenant), [
+        {"id": tenant1_id, "name": "Tenant 1", "status": "ACTIVE"},
+        {"id": tenant2_id, "name": "Tenant 2", "status": "ACTIVE"},
+    ])
     
-    user2 = User(
-        tenant_id=tenant2.id,
-        corporate_email="tenant2user@example.com",
-        first_name="T2",
-        last_name="User",
-        org_role="tenant_user",
-        password_hash=get_password_hash("password"),
-        status="ACTIVE"
-    )
+    db_session.execute(insert(Department), [
+        {"id": department1_id, "tenant_id": tenant1_id, "name": "Tenant 1"},
+        {"id": department2_id, "tenant_id": tenant2_id, "name": "Tenant 2"},
+    ])
     
-    db_session.add_all([user1, user2])
-    db_session.flush()
+    # Create users in each tenant
+    user_rows = [
+        {
+            "id": user1_id,
+            "tenant_id": tenant1_id,
+            "department_id": department1_id,
+            "corporate_email": "tenant1user@example.com",
+            "first_name": "T1",
+            "last_name": "User",
+            "org_role": "tenant_user",
+            "password_hash": password_hash,
+            "status": "ACTIVE"
+        },
+        {
+            "id": user2_id,
+            "tenant_id": tenant2_id,
+            "department_id": department2_id,
+            "corporate_email": "tenant2user@example.com",
+            "first_name": "T2",
+            "last_name": "User",
+            "org_role": "tenant_user",
+            "password_hash": password_hash,
+            "status": "ACTIVE"
+        },
+    ]
+    db_session.execute(insert(User), user_rows)
     
     # Create wallets
-    wallet1 = Wallet(user_id=user1.id, tenant_id=tenant1.id, current_balance=5000)
-    wallet2 = Wallet(user_id=user2.id, tenant_id=tenant2.id, current_balance=5000)
-    db_session.add_all([wallet1, wallet2])
+    db_session.execute(insert(Wallet), [
+        {"user_id": user1_id, "tenant_id": tenant1_id, "balance": 5000},
+        {"user_id": user2_id, "tenant_id": tenant2_id, "balance": 5000},
+    ])
     
     # Create rewards in each tenant
-    reward1 = Reward(
-        tenant_id=tenant1.id,
-        name="Tenant1 Reward",
-        description="Reward for tenant 1",
-        cost_points=500,
-        category="Test"
-    )
-    
-    reward2 = Reward(
-        tenant_id=tenant2.id,
-        name="Tenant2 Reward",
-        description="Reward for tenant 2",
-        cost_points=500,
-        category="Test"
-    )
-    
-    db_session.add_all([reward1, reward2])
+    db_session.execute(insert(RewardCatalogCustom), [
+        {
+            "id": reward1_id,
+            "tenant_id": tenant1_id,
+            "name": "Tenant1 Reward",
+            "description": "Reward for tenant 1",
+            "points_cost": 500,
+            "category": "Test"
+        },
+        {
+            "id": reward2_id,
+            "tenant_id": tenant2_id,
+            "name": "Tenant2 Reward",
+            "description": "Reward for tenant 2",
+            "points_cost": 500,
+            "category": "Test"
+        },
+    ])
     db_session.commit()
     
-    from core.security import create_access_token
-    
     return {
-        'tenant1_user_token': create_access_token(user_id=str(user1.id)),
-        'tenant2_reward': reward2
+        'tenant1_user_token': user_token(SimpleNamespace(**user_rows[0])),
+        'tenant2_reward': db_session.get(RewardCatalogCustom, reward2_id)
     }
@@ -1,28 +1,48 @@
 import pytest
-from fastapi.testclient import TestClient
 
-from main import app
+SEEDED_ADMIN_LOGIN = {"email": "admin@sparknode.io", "password": "jspark123"}
 
 
-client = TestClient(app)
-
-
-def test_health_endpoint():
+def test_health_endpoint(client):
     r = client.get("/health")
     assert r.status_code == 200
     assert r.json().get("status") == "healthy"
 
 
-def test_auth_login_seeded_admin():
+@pytest.mark.seeded
+def test_auth_login_seeded_admin(client):
     """Verify seeded system admin can login (requires DB + seed present).
 
     This smoke test expects the local dev DB to be seeded with admin@sparknode.io
     and password `jspark123` as provided in `database/seed.sql`.
     """
-    payload = {"email": "admin@sparknode.io", "password": "jspark123"}
-    r = client.post("/api/auth/login", json=payload)
+    r = client.post("/api/auth/login", json=SEEDED_ADMIN_LOGIN)
 
     # If DB is not reachable or app not started correctly, give a helpful message
     assert r.status_code == 200, f"Auth login failed: {r.status_code} - {r.text}"
     body = r.json()
     assert "access_token" in body and body["access_token"], "No access token returned"
+
+
+@pytest.mark.slow
+@pytest.mark.seeded
+@pytest.mark.benchmark(group="auth")
+def test_login_bench(request, client):
+    """Time the seeded-admin login (bcrypt verify included) when pytest-benchmark is installed.
+
+    Pedantic mode pins the run to 5 rounds of 1 call after 1 warmup, so the
+    plugin's auto-calibration never drives bcrypt hundreds of times.
+    Correctness stays with test_auth_login_seeded_admin.
+    """
+    pytest.importorskip("pytest_benchmark")
+    benchmark = request.getfixturevalue("benchmark")
+
+    r = benchmark.pedantic(
+        client.post,
+        args=("/api/auth/login",),
+        kwargs={"json": SEEDED_ADMIN_LOGIN},
+        rounds=5,
+        iterations=1,
+        warmup_rounds=1,
+    )
+    assert r.status_code == 200
@@ -1,38 +1,63 @@
-from database import engine
+import pytest
 from sqlalchemy import text
 
 USER_EMAIL = 'super_user@sparknode.io'
 
+# User row, its system_admin row and its latest 50 audit-log entries in one round trip
+SUPER_USER_REPORT = text("""
+    WITH u AS (
+        SELECT id, corporate_email, status, password_hash IS NOT NULL AS has_password,
+               to_char(created_at, 'YYYY-MM-DD HH24:MI:SS TZ') AS created_at
+        FROM users WHERE corporate_email = :email
+    ),
+    a AS (
+        SELECT admin_id, user_id, access_level, mfa_enabled,
+               to_char(last_login_at, 'YYYY-MM-DD HH24:MI:SS TZ') AS last_login_at
+        FROM system_admins WHERE user_id = (SELECT id FROM u)
+    ),
+    l AS (
+        SELECT id, action, entity_type,
+               to_char(created_at, 'YYYY-MM-DD HH24:MI:SS TZ') AS created_at,
+               row_number() OVER (ORDER BY audit_log.created_at DESC) AS n
+        FROM audit_log WHERE actor_id = (SELECT id FROM u)
+        ORDER BY n LIMIT 50
+    )
+    SELECT (SELECT row_to_json(u) FROM u) AS user_row,
+           (SELECT row_to_json(a) FROM a) AS admin_row,
+           (SELECT json_agg(l ORDER BY l.n) FROM l) AS logs
+""")
 
-def test_super_user_logs_printout():
-    with engine.connect() as conn:
-        user = conn.execute(text("SELECT id, corporate_email, status, password_hash IS NOT NULL AS has_password, to_char(created_at, 'YYYY-MM-DD HH24:MI:SS TZ') as created_at FROM users WHERE corporate_email = :email"), {'email': USER_EMAIL}).fetchone()
-        assert user is not None, 'super_user not found in users table'
-        print('\nUSER:')
-        print('id:', user.id)
-        print('email:', user.corporate_email)
-        print('status:', user.status)
-        print('has_password:', user.has_password)
-        print('created_at:', user.created_at)
 
-        admin = conn.execute(text("SELECT admin_id, user_id, access_level, mfa_enabled, to_char(last_login_at, 'YYYY-MM-DD HH24:MI:SS TZ') as last_login_at FROM system_admins WHERE user_id = (SELECT id FROM users WHERE corporate_email = :email)"), {'email': USER_EMAIL}).fetchone()
-        print('\nSYSTEM_ADMIN:')
-        if not admin:
-            print('No system_admin row found')
-        else:
-            print('admin_id:', admin.admin_id)
-            print('user_id:', admin.user_id)
-            print('access_level:', admin.access_level)
-            print('mfa_enabled:', admin.mfa_enabled)
-            print('last_login_at:', admin.last_login_at)
+@pytest.mark.verbose
+def test_super_user_logs_printout(pg_conn):
+    report = pg_conn.execute(SUPER_USER_REPORT, {'email': USER_EMAIL}).one()
+    user = report.user_row
+    assert user is not None, 'super_user not found in users table'
+    print('\nUSER:')
+    print('id:', user['id'])
+    print('email:', user['corporate_email'])
+    print('status:', user['status'])
+    print('has_password:', user['has_password'])
+    print('created_at:', user['created_at'])
 
-        print('\nAUDIT LOGS:')
-        rows = conn.execute(text("SELECT id, action, entity_type, to_char(created_at, 'YYYY-MM-DD HH24:MI:SS TZ') as created_at FROM audit_log WHERE actor_id = (SELECT id FROM users WHERE corporate_email = :email) ORDER BY created_at DESC LIMIT 50"), {'email': USER_EMAIL}).fetchall()
-        if not rows:
-            print('No audit log entries found for this user')
-        else:
-            for r in rows:
-                print(f"{r.created_at} | {r.id} | {r.action} | {r.entity_type}")
+    admin = report.admin_row
+    print('\nSYSTEM_ADMIN:')
+    if not admin:
+        print('No system_admin row found')
+    else:
+        print('admin_id:', admin['admin_id'])
+        print('user_id:', admin['user_id'])
+        print('access_level:', admin['access_level'])
+        print('mfa_enabled:', admin['mfa_enabled'])
+        print('last_login_at:', admin['last_login_at'])
+
+    print('\nAUDIT LOGS:')
+    rows = report.logs
+    if not rows:
+        print('No audit log entries found for this user')
+    else:
+        for r in rows:
+            print(f"{r['created_at']} | {r['id']} | {r['action']} | {r['entity_type']}")
 
     # Keep test passing
     assert True
@@ -21,8 +21,8 @@ from datetime import datetime, timedelta
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event
 from sqlalchemy.pool import StaticPool
 
 from main import app
@@ -41,7 +41,20 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
-TestingSessionLocal = None
+
+# pysqlite defers BEGIN on its own and breaks SAVEPOINT; hand transaction
+# control to SQLAlchemy so the per-test SAVEPOINTs below behave
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def override_get_db():
     try:
@@ -51,19 +64,29 @@ def override_get_db():
         db.close()
 
 
-@pytest.fixture(scope="function")
-def db():
-    """Create tables and provide a database session for testing"""
-    global TestingSessionLocal
-    from sqlalchemy.orm import sessionmaker
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
+@pytest.fixture(scope="module")
+def _schema():
+    """Create the tables once for this module's in-memory database"""
     Base.metadata.create_all(bind=engine)
-    
-    _db = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db(_schema):
+    """Database session inside a transaction that is rolled back after the test.
+
+    join_transaction_mode="create_savepoint" runs the session, and so every
+    endpoint db.commit(), inside a SAVEPOINT and opens a fresh one after each
+    commit; the outer transaction is never committed, so teardown is one ROLLBACK.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    _db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     yield _db
     _db.close()
-    Base.metadata.drop_all(bind=engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture
@@ -359,6 +382,7 @@ class TestAdminUserCreation:
         assert admin_user.status == "ACTIVE"  # Not 'active'
         assert admin_user.is_super_admin is True
     
+    @pytest.mark.password_hashing
     def test_admin_password_hashed(self, client, platform_admin_token, db):
         """Test that admin password is properly hashed"""
         payload = {
@@ -85,6 +85,7 @@ class TestMobileCleaning:
         assert result == "+919876543210"
 
 
+@pytest.mark.password_hashing
 class TestPasswordHashing:
     """Test password hashing and verification"""
     
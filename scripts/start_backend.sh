@@ -11,6 +11,7 @@ PIDFILE="/tmp/uvicorn.pid"
 PORT=${SPARKNODE_PORT:-8000}
 HOST=${SPARKNODE_HOST:-0.0.0.0}
 PYTHON=${PYTHON:-python3}
+WORKERS=${UVICORN_WORKERS:-1}
 
 echo "Working directory: $WORKDIR"
 
@@ -30,6 +31,9 @@ fi
 
 echo "Starting backend (uvicorn) on $HOST:$PORT, logs -> $LOG"
 cd "$WORKDIR/backend" || exit 1
-nohup $PYTHON -m uvicorn main:app --host $HOST --port $PORT > "$LOG" 2>&1 &
+# uvloop + httptools ship with uvicorn[standard]; name them so a missing
+# extra fails loudly instead of silently falling back to asyncio/h11
+nohup $PYTHON -m uvicorn main:app --host $HOST --port $PORT \
+  --loop uvloop --http httptools --workers $WORKERS > "$LOG" 2>&1 &
 echo $! > "$PIDFILE"
 echo "Started uvicorn pid=$(cat $PIDFILE), logs at $LOG"